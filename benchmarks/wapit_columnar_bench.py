@@ -0,0 +1,35 @@
+import os
+import sys
+import json
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), "..", "src"))
+
+from utils.wapit_stats import aggregate_player_stats, to_columnar
+from utils.helper import json_body_with
+from wapit_stats_bench import make_tournament, best_of
+
+'''
+Payload size and json.dumps time of the default get_all_wapit_stats "stats"
+map against format=columnar, on the synthetic full tournament. "cached" is
+a repeat request: the serialized columnar stats are cached per stats Version
+and only the small envelope around them is dumped.
+
+    python benchmarks/wapit_columnar_bench.py
+'''
+
+if __name__ == "__main__":
+    stats = aggregate_player_stats(make_tournament())
+    columnar = to_columnar(stats)
+
+    default_json = json.dumps(stats)
+    columnar_json = json.dumps(columnar)
+    default_time = best_of(json.dumps, stats)
+    columnar_time = best_of(lambda s: json.dumps(to_columnar(s)), stats)
+    envelope = {"timeElapsed": 0.01, "year": "2025", "version": 12, "format": "columnar"}
+    cached_time = best_of(lambda text: json_body_with(envelope, "stats", text), columnar_json)
+
+    print(f"default:  {len(default_json) / 1024:8.1f} KB  {default_time * 1000:7.2f} ms")
+    print(f"columnar: {len(columnar_json) / 1024:8.1f} KB  {columnar_time * 1000:7.2f} ms (including conversion)")
+    print(f"cached:   {len(columnar_json) / 1024:8.1f} KB  {cached_time * 1000:7.2f} ms (serialized body cached)")
+    print(f"size:     {len(default_json) / len(columnar_json):8.1f}x smaller")
+    print(f"time:     {default_time / columnar_time:8.1f}x faster, {default_time / cached_time:.1f}x cached")
@@ -0,0 +1,148 @@
+import os
+import sys
+import time
+import random
+import string
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), "..", "src"))
+
+from utils.wapit_stats import aggregate_player_stats
+
+'''
+Compares the original roster x boxscore scan in get_all_wapit_stats with the
+hash-indexed engine in utils/wapit_stats.py on a synthetic full tournament:
+4 First Four games plus 63 bracket games, 15 roster players per team.
+
+    python benchmarks/wapit_stats_bench.py
+'''
+
+ROSTER_SIZE = 15
+STAT_FIELDS = ["points", "totalRebounds", "assists", "steals", "blockedShots",
+               "turnovers", "personalFouls", "minutesPlayed", "fieldGoalsMade",
+               "fieldGoalsAttempted", "threePointsMade", "threePointsAttempted",
+               "freeThrowsMade", "freeThrowsAttempted", "offensiveRebounds"]
+ROUNDS = [(1, "First Four", 4), (2, "First Round", 32), (3, "Second Round", 16), (4, "Sweet 16", 8),
+          (5, "Elite Eight", 4), (6, "Final Four", 2), (7, "Championship", 1)]
+
+
+def _name():
+    return "".join(random.choices(string.ascii_lowercase, k=random.randint(4, 9))).title()
+
+
+def make_team(org_id):
+    return {
+        "ncaaOrgId": org_id,
+        "nameFull": f"School {org_id}",
+        "nameShort": f"S{org_id}",
+        "name6Char": f"S{org_id}"[:6],
+        "seoname": f"school-{org_id}",
+        "nickname": f"Mascots {org_id}",
+        "color": "#003366",
+        "seed": random.randint(1, 16),
+        "roster": [
+            {"id": f"{org_id}-{i}", "firstName": _name(), "lastName": _name(), "jerseyNumber": str(i),
+             "position": random.choice("GFC"), "height": "6-5", "year": "Sr"}
+            for i in range(ROSTER_SIZE)
+        ],
+    }
+
+
+# Full tournament payload shaped like data.mmlContests
+def make_tournament(seed=2025):
+    random.seed(seed)
+    teams = [make_team(org_id) for org_id in range(1, 69)]
+    contests = []
+    next_team = 0
+    for round_number, title, games in ROUNDS:
+        for g in range(games):
+            pair = [teams[(next_team + k) % len(teams)] for k in range(2)]
+            next_team += 2
+            winner = random.randint(0, 1)
+            game_teams = [
+                {**t, "isWinner": i == winner, "score": random.randint(50, 95)}
+                for i, t in enumerate(pair)
+            ]
+            contests.append({
+                "contestId": f"{round_number}{g:02d}",
+                "bracketId": round_number * 100 + g,
+                "gameState": "F",
+                "startDate": "03/21/2025",
+                "broadcaster": {"name": "CBS"},
+                "condensedVideo": None,
+                "location": {"venue": "Arena"},
+                "region": {"title": "EAST"},
+                "round": {"roundNumber": round_number, "title": title},
+                "teams": game_teams,
+                "boxscore": {"teamBoxscore": [
+                    {
+                        "ncaaOrgId": t["ncaaOrgId"],
+                        "nameFull": t["nameFull"],
+                        "playerStats": [
+                            {"fname": p["firstName"], "lname": p["lastName"], "num": int(p["jerseyNumber"]),
+                             **{field: random.randint(0, 20) for field in STAT_FIELDS}}
+                            for p in t["roster"][:12]
+                        ],
+                    }
+                    for t in game_teams
+                ]},
+            })
+    return contests
+
+
+# The loop get_all_wapit_stats used before the engine, kept for comparison
+def legacy_aggregate(game_stats):
+    filtered_games = [game for game in game_stats if (game["gameState"] != "P" and game["round"]["roundNumber"] > 1)]
+    player_stats = {}
+    for game in filtered_games:
+        for team in game["teams"]:
+            for player in team["roster"]:
+                player_team_boxscore = next((t for t in game["boxscore"]["teamBoxscore"] if t["ncaaOrgId"] == team["ncaaOrgId"]), None)
+                player_boxscore = next((p for p in player_team_boxscore["playerStats"] if (p["fname"] + " " + p["lname"]) == (player["firstName"] + " " + player["lastName"])), None)
+                if (not player_boxscore):
+                    continue
+                row = {
+                    "bracketId": game["bracketId"],
+                    "contestId": game["contestId"],
+                    "roundName": game["round"]["title"],
+                    "startDate": game["startDate"],
+                    "gameState": game["gameState"],
+                    "isWinner": team["isWinner"],
+                    "score": team["score"],
+                    **player_boxscore
+                }
+                if player["id"] not in player_stats:
+                    player_stats[player["id"]] = {
+                        **player,
+                        "schoolColor": team["color"],
+                        "seed": team["seed"],
+                        "schoolNameFull": team["nameFull"],
+                        "schoolNameShort": team["nameShort"],
+                        "schoolName6Char": team["name6Char"],
+                        "schoolSeoName": team["seoname"],
+                        "schoolNickname": team["nickname"],
+                        "boxscores": [row]
+                    }
+                else:
+                    player_stats[player["id"]]["boxscores"].append(row)
+    return player_stats
+
+
+def best_of(fn, payload, runs=50):
+    best = float("inf")
+    for _ in range(runs):
+        start = time.perf_counter()
+        fn(payload)
+        best = min(best, time.perf_counter() - start)
+    return best
+
+
+if __name__ == "__main__":
+    contests = make_tournament()
+    assert legacy_aggregate(contests) == aggregate_player_stats(contests)
+
+    legacy = best_of(legacy_aggregate, contests)
+    engine = best_of(aggregate_player_stats, contests)
+    print(f"games: {len(contests)}  players: {len(aggregate_player_stats(contests))}")
+    print(f"legacy scan:    {legacy * 1000:8.2f} ms")
+    print(f"indexed engine: {engine * 1000:8.2f} ms")
+    print(f"speedup:        {legacy / engine:8.1f}x")
@@ -0,0 +1,55 @@
+import os
+import sys
+import json
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), "..", "src"))
+os.environ.setdefault("AWS_DEFAULT_REGION", "us-east-1")
+
+from botocore.exceptions import ClientError
+from api.wapit_realtime import broadcast
+
+'''
+WebSocket fan-out with nothing from AWS: an in-memory wapit_connections table
+and a management API stub that records what it was sent and reports one
+connection as gone, the way API Gateway does for a closed socket.
+
+    python examples/wapit_broadcast_stub.py
+'''
+
+
+# The two Table calls broadcast makes, over {LeagueKey: [ConnectionID, ...]}
+class ConnectionsTable:
+    def __init__(self, connections):
+        self.connections = connections
+
+    def query(self, **kwargs):
+        league_key = kwargs["KeyConditionExpression"].get_expression()["values"][1]
+        return {"Items": [{"ConnectionID": c} for c in self.connections.get(league_key, [])]}
+
+    def delete_item(self, Key):
+        self.connections[Key["LeagueKey"]].remove(Key["ConnectionID"])
+
+
+# post_to_connection only, GoneException for the connection ids in gone
+class ManagementApi:
+    def __init__(self, gone=()):
+        self.gone = set(gone)
+        self.sent = {}
+
+    def post_to_connection(self, ConnectionId, Data):
+        if ConnectionId in self.gone:
+            raise ClientError({"Error": {"Code": "GoneException", "Message": "Gone"}}, "PostToConnection")
+        self.sent[ConnectionId] = json.loads(Data)
+
+
+if __name__ == "__main__":
+    table = ConnectionsTable({"abc2025": ["c1", "c2", "c3"], "xyz2025": ["c9"]})
+    api = ManagementApi(gone={"c2"})
+
+    delivered = broadcast("abc2025", {"type": "draft.changed"}, api=api, table=table)
+
+    print(f"delivered    {delivered}")
+    print(f"sent         {api.sent}")
+    print(f"connections  {table.connections}")
+    assert delivered == 2 and set(api.sent) == {"c1", "c3"}
+    assert table.connections == {"abc2025": ["c1", "c3"], "xyz2025": ["c9"]}
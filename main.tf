@@ -211,7 +211,7 @@ data "aws_iam_policy_document" "lambda_logging_policy_document" {
   statement {
     sid = "DynamoDB"
     effect = "Allow"
-    resources = [aws_dynamodb_table.vsnandy_db.arn, aws_dynamodb_table.wapit_db.arn, aws_dynamodb_table.wapit_meta.arn, aws_dynamodb_table.pick_poolr.arn]
+    resources = [aws_dynamodb_table.vsnandy_db.arn, aws_dynamodb_table.wapit_db.arn, aws_dynamodb_table.wapit_meta.arn, aws_dynamodb_table.pick_poolr.arn, aws_dynamodb_table.wapit_stats.arn, aws_dynamodb_table.wapit_connections.arn, "${aws_dynamodb_table.wapit_connections.arn}/index/*"]
     actions = [
       "dynamodb:BatchGetItem",
       "dynamodb:GetItem",
@@ -233,6 +233,14 @@ data "aws_iam_policy_document" "lambda_logging_policy_document" {
       "cognito-idp:ListUsersInGroup"
     ]
   }
+
+  // IAM policy for lambda => WebSocket clients (chat/draft push)
+  statement {
+    sid = "WebSocket"
+    effect = "Allow"
+    resources = ["${aws_apigatewayv2_api.ws.execution_arn}/*"]
+    actions = ["execute-api:ManageConnections"]
+  }
 }
 
 // Create the logging_policy from the lambda_logging_policy
@@ -267,6 +275,13 @@ resource "aws_lambda_function" "lambda_function" {
   timeout = 30 # Timeout in seconds, default is 3 seconds
   depends_on = [aws_iam_role_policy_attachment.attach_logging_policy_to_lambda_role]
   source_code_hash = data.archive_file.lambda_zip.output_base64sha256
+
+  environment {
+    variables = {
+      # Management API endpoint for pushing to WebSocket clients
+      WEBSOCKET_ENDPOINT = replace(aws_apigatewayv2_stage.ws.invoke_url, "wss://", "https://")
+    }
+  }
 }
 
 // DynamoDB deployment
@@ -356,6 +371,12 @@ resource "aws_dynamodb_table" "wapit_db" {
     type = "N"
   }
 
+  # Chat messages already rolled into archive blocks (compact_wapit_chat)
+  ttl {
+    attribute_name = "ExpiresAt"
+    enabled        = true
+  }
+
   attribute {
     name = "TeamID"
     type = "S"
@@ -388,12 +409,125 @@ resource "aws_dynamodb_table" "wapit_meta" {
     type = "S"
   }
 
+  # Cached league membership items ({league}{year}#MEMBERS) expire on their own
+  ttl {
+    attribute_name = "ExpiresAt"
+    enabled        = true
+  }
+
   tags = {
     Name        = "wapit_meta"
     Environment = "prod"
   }
 }
 
+# Materialized WAPIT player stats, one partition per tournament year
+resource "aws_dynamodb_table" "wapit_stats" {
+  name           = "wapit_stats"
+  billing_mode   = "PROVISIONED"
+  read_capacity  = 1
+  write_capacity = 1
+  hash_key       = "Year"
+  range_key      = "ItemKey"
+
+  attribute {
+    name = "Year"
+    type = "S"
+  }
+
+  attribute {
+    name = "ItemKey"
+    type = "S"
+  }
+
+  tags = {
+    Name        = "wapit_stats"
+    Environment = "prod"
+  }
+}
+
+# Open WAPIT WebSocket connections, one partition per league
+resource "aws_dynamodb_table" "wapit_connections" {
+  name           = "wapit_connections"
+  billing_mode   = "PROVISIONED"
+  read_capacity  = 1
+  write_capacity = 1
+  hash_key       = "LeagueKey"
+  range_key      = "ConnectionID"
+
+  attribute {
+    name = "LeagueKey"
+    type = "S"
+  }
+
+  attribute {
+    name = "ConnectionID"
+    type = "S"
+  }
+
+  # $disconnect only knows the connection id
+  global_secondary_index {
+    name            = "ConnectionID-index"
+    hash_key        = "ConnectionID"
+    projection_type = "KEYS_ONLY"
+    read_capacity   = 1
+    write_capacity  = 1
+  }
+
+  # Connections that never sent $disconnect
+  ttl {
+    attribute_name = "ExpiresAt"
+    enabled        = true
+  }
+
+  tags = {
+    Name        = "wapit_connections"
+    Environment = "prod"
+  }
+}
+
+// SCHEDULED TASKS
+# Fold newly final March Madness games into wapit_stats
+resource "aws_cloudwatch_event_rule" "poll_wapit_games" {
+  name                = "vsnandy-poll-wapit-games"
+  description         = "Poll tournament games and materialize WAPIT stats for the games that changed"
+  # Every minute in March and April only, the tournament window
+  schedule_expression = "cron(* * * 3-4 ? *)"
+}
+
+resource "aws_cloudwatch_event_target" "poll_wapit_games" {
+  rule  = aws_cloudwatch_event_rule.poll_wapit_games.name
+  arn   = aws_lambda_function.lambda_function.arn
+  input = jsonencode({ task = "poll_wapit_games" })
+}
+
+resource "aws_lambda_permission" "poll_wapit_games" {
+  action        = "lambda:InvokeFunction"
+  function_name = aws_lambda_function.lambda_function.function_name
+  principal     = "events.amazonaws.com"
+  source_arn    = aws_cloudwatch_event_rule.poll_wapit_games.arn
+}
+
+# Roll old WAPIT chat messages into archive blocks
+resource "aws_cloudwatch_event_rule" "compact_wapit_chat" {
+  name                = "vsnandy-compact-wapit-chat"
+  description         = "Archive WAPIT chat messages older than 30 days"
+  schedule_expression = "rate(1 day)"
+}
+
+resource "aws_cloudwatch_event_target" "compact_wapit_chat" {
+  rule  = aws_cloudwatch_event_rule.compact_wapit_chat.name
+  arn   = aws_lambda_function.lambda_function.arn
+  input = jsonencode({ task = "compact_wapit_chat" })
+}
+
+resource "aws_lambda_permission" "compact_wapit_chat" {
+  action        = "lambda:InvokeFunction"
+  function_name = aws_lambda_function.lambda_function.function_name
+  principal     = "events.amazonaws.com"
+  source_arn    = aws_cloudwatch_event_rule.compact_wapit_chat.arn
+}
+
 // COGNITO RESOURCES
 resource "aws_cognito_user_pool" "pool" {
   name = "vsnandy-users"
@@ -629,6 +763,18 @@ resource "aws_apigatewayv2_route" "post_league" {
   target    = "integrations/${aws_apigatewayv2_integration.lambda.id}"
 }
 
+resource "aws_apigatewayv2_route" "get_leaderboard" {
+  api_id    = aws_apigatewayv2_api.api.id
+  route_key = "GET /ncaa/wapit/league/{league_id}/year/{year}/leaderboard"
+  target    = "integrations/${aws_apigatewayv2_integration.lambda.id}"
+}
+
+resource "aws_apigatewayv2_route" "get_draft_changes" {
+  api_id    = aws_apigatewayv2_api.api.id
+  route_key = "GET /ncaa/wapit/league/{league_id}/year/{year}/draft/changes"
+  target    = "integrations/${aws_apigatewayv2_integration.lambda.id}"
+}
+
 # Authenticated routes — JWT authorizer required
 resource "aws_apigatewayv2_route" "post_create_league" {
   api_id             = aws_apigatewayv2_api.api.id
@@ -670,6 +816,14 @@ resource "aws_apigatewayv2_route" "post_draft_bulk" {
   authorizer_id      = aws_apigatewayv2_authorizer.api_gw_auth.id
 }
 
+resource "aws_apigatewayv2_route" "post_draft_pick" {
+  api_id             = aws_apigatewayv2_api.api.id
+  route_key          = "POST /ncaa/wapit/league/{league_id}/year/{year}/draft/pick"
+  target             = "integrations/${aws_apigatewayv2_integration.lambda.id}"
+  authorization_type = "JWT"
+  authorizer_id      = aws_apigatewayv2_authorizer.api_gw_auth.id
+}
+
 # API GW Authorizer 
 resource "aws_apigatewayv2_authorizer" "api_gw_auth" {
   name = "vsnandy_api_gw_cognito_authorizer"
@@ -811,6 +965,51 @@ resource "aws_apigatewayv2_route" "default_route" {
 }
 */
 
+# WebSocket API — WAPIT chat and draft push, handled by the same lambda
+resource "aws_apigatewayv2_api" "ws" {
+  name                       = "vsnandy-ws"
+  protocol_type              = "WEBSOCKET"
+  route_selection_expression = "$request.body.action"
+}
+
+resource "aws_apigatewayv2_integration" "ws_lambda" {
+  api_id             = aws_apigatewayv2_api.ws.id
+  integration_type   = "AWS_PROXY"
+  integration_method = "POST"
+  integration_uri    = aws_lambda_function.lambda_function.invoke_arn
+}
+
+resource "aws_apigatewayv2_route" "ws_connect" {
+  api_id    = aws_apigatewayv2_api.ws.id
+  route_key = "$connect"
+  target    = "integrations/${aws_apigatewayv2_integration.ws_lambda.id}"
+}
+
+resource "aws_apigatewayv2_route" "ws_disconnect" {
+  api_id    = aws_apigatewayv2_api.ws.id
+  route_key = "$disconnect"
+  target    = "integrations/${aws_apigatewayv2_integration.ws_lambda.id}"
+}
+
+resource "aws_apigatewayv2_route" "ws_default" {
+  api_id    = aws_apigatewayv2_api.ws.id
+  route_key = "$default"
+  target    = "integrations/${aws_apigatewayv2_integration.ws_lambda.id}"
+}
+
+resource "aws_apigatewayv2_stage" "ws" {
+  api_id      = aws_apigatewayv2_api.ws.id
+  name        = var.STAGE
+  auto_deploy = true
+}
+
+resource "aws_lambda_permission" "ws" {
+  action        = "lambda:InvokeFunction"
+  function_name = aws_lambda_function.lambda_function.function_name
+  principal     = "apigateway.amazonaws.com"
+  source_arn    = "${aws_apigatewayv2_api.ws.execution_arn}/*/*"
+}
+
 # Permission
 resource "aws_lambda_permission" "apigw" {
   action = "lambda:InvokeFunction"
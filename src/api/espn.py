@@ -1,6 +1,11 @@
+import re
 import json
 import urllib3
 
+from utils.athlete_index import AthleteIndex
+from utils.cache import cache_get, cache_set
+from utils.disk_cache import open_dataset, write_dataset
+
 ESPN_SPORTS_URL = "https://sports.core.api.espn.com"
 ESPN_SITE_WEB_URL = "https://site.web.api.espn.com"
 ESPN_SITE_URL = "https://site.api.espn.com"
@@ -8,6 +13,10 @@ ESPN_CDN_URL = "https://cdn.espn.com"
 
 http = urllib3.PoolManager()
 
+# Athlete catalog snapshots used by the search index
+ATHLETE_CATALOG_PAGE_SIZE = 1000
+ATHLETE_CATALOG_MAX_AGE = 24 * 60 * 60
+
 # Get All Players for Sport
 # GET /espn/athletes?sport=:sport&league=:league&limit=:limit&page=:page
 def get_athletes(event, logger):
@@ -777,4 +786,89 @@ def get_specific_nights(event, logger):
     except Exception as e:
         logger.exception("Exception in Get Specific Nights !!")
         logger.exception(e)
-        return json.dumps("Server error")
\ No newline at end of file
+        return json.dumps("Server error")
+
+# Trim an ESPN core API athlete down to what the search index needs
+def _catalog_athlete(item):
+    team = item.get("team") or {}
+    team_id = team.get("id")
+    if team_id is None and "$ref" in team:
+        match = re.search(r"/teams/(\d+)", team["$ref"])
+        team_id = match.group(1) if match else None
+
+    return {
+        "id": item["id"],
+        "name": item.get("fullName") or item.get("displayName", ""),
+        "team": team_id,
+        "position": (item.get("position") or {}).get("abbreviation"),
+    }
+
+# Page through every athlete for a sport/league
+def sync_athlete_catalog(sport, league, logger):
+    athletes = []
+    page, page_count = 1, 1
+    while page <= page_count:
+        response = http.request(
+            "GET",
+            f"{ESPN_SPORTS_URL}/v3/sports/{sport}/{league}/athletes?limit={ATHLETE_CATALOG_PAGE_SIZE}&page={page}"
+        )
+        logger.info(f"Athlete catalog page {page} Response Code: {response.status}")
+        data = json.loads(response.data)
+        athletes.extend(_catalog_athlete(item) for item in data["items"] if "id" in item)
+        page_count = data.get("pageCount", 1)
+        page += 1
+
+    return athletes
+
+# Get the athlete search index for a sport/league
+# Memory cache, then the /tmp snapshot, then a full catalog sync
+def load_athlete_index(sport, league, logger):
+    cache_key = f"espn:athlete-index:{sport}:{league}"
+    index = cache_get(cache_key)
+    if index is not None:
+        return index
+
+    dataset_name = f"espn_athletes_{sport}_{league}"
+    snapshot = open_dataset(dataset_name, max_age=ATHLETE_CATALOG_MAX_AGE)
+    if snapshot is not None:
+        try:
+            index = AthleteIndex.from_dict(snapshot.get("catalog"))
+        finally:
+            snapshot.close()
+    else:
+        index = AthleteIndex.from_athletes(sync_athlete_catalog(sport, league, logger))
+        write_dataset(dataset_name, [("catalog", index.to_dict())], meta={"sport": sport, "league": league})
+
+    logger.info(f"Athlete index for {sport}/{league} holds {len(index)} athletes")
+    return cache_set(cache_key, index, ttl=ATHLETE_CATALOG_MAX_AGE)
+
+# Search athletes by name (typeahead)
+# GET /espn/athletes/search?sport=football&league=nfl&q=mahom&team=12&position=QB&limit=10
+def get_athlete_search(event, logger):
+    try:
+        params = event.get("queryStringParameters") or {}
+        sport = params.get("sport", "football")
+        league = params.get("league", "college-football")
+        query = params.get("q", "").strip()
+        team = params.get("team", None)
+        position = params.get("position", None)
+        limit = params.get("limit", 10)
+
+        if not query:
+            return 400, {"Message": "q parameter is required"}
+        if not str(limit).isdigit():
+            return 400, {"Message": "limit must be a positive number"}
+
+        index = load_athlete_index(sport, league, logger)
+        results = index.search(query, team=team, position=position, limit=int(limit))
+
+        return 200, {
+            "query": query,
+            "count": len(results),
+            "athletes": results
+        }
+
+    except Exception as e:
+        logger.exception("Exception in Get Athlete Search !!")
+        logger.exception(e)
+        return 500, {"error": "Server error"}
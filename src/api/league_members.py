@@ -0,0 +1,58 @@
+import time
+import boto3
+
+from utils.cache import cache_get, cache_set, cache_delete
+from utils.helper import get_users_in_group
+
+'''
+Cached WAPIT league membership (the "wapit_{league}{year}" Cognito group).
+
+    memory   per container, MEMBERS_MEMORY_TTL - also bounds how long another
+             container can serve a list that was invalidated elsewhere
+    shared   wapit_meta item LeagueID = "{league}{year}#MEMBERS" with Users,
+             CachedAt and ExpiresAt, shared by every container
+    Cognito  paged list_users_in_group, written back to both tiers
+
+Anything that changes who is in a league calls invalidate_league_members.
+'''
+
+MEMBERS_MEMORY_TTL = 60
+MEMBERS_SHARED_TTL = 60 * 60
+
+dynamodb = boto3.resource("dynamodb")
+meta_table = dynamodb.Table("wapit_meta")
+
+
+def _memory_key(league_key):
+    return f"cognito:members:{league_key}"
+
+
+def _shared_key(league_key):
+    return {"LeagueID": f"{league_key}#MEMBERS"}
+
+
+# Members of a league ({league_id}{year}), trimmed Cognito user records
+def get_league_members(cognito, user_pool_id, league_key, logger):
+    users = cache_get(_memory_key(league_key))
+    if users is not None:
+        return users
+
+    item = meta_table.get_item(Key=_shared_key(league_key), ConsistentRead=True).get("Item")
+    if item is not None and int(item["ExpiresAt"]) > time.time():
+        return cache_set(_memory_key(league_key), item["Users"], ttl=MEMBERS_MEMORY_TTL)
+
+    users = get_users_in_group(cognito, user_pool_id, f"wapit_{league_key}", logger)
+    now = int(time.time())
+    meta_table.put_item(Item={
+        **_shared_key(league_key),
+        "Users": users,
+        "CachedAt": now,
+        "ExpiresAt": now + MEMBERS_SHARED_TTL,
+    })
+    return cache_set(_memory_key(league_key), users, ttl=MEMBERS_MEMORY_TTL)
+
+
+# Drop both tiers, the next read goes to Cognito
+def invalidate_league_members(league_key):
+    cache_delete(_memory_key(league_key))
+    meta_table.delete_item(Key=_shared_key(league_key))
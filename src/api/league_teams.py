@@ -0,0 +1,96 @@
+import boto3
+from datetime import datetime
+
+'''
+Materialized WAPIT team rosters, one wapit_meta item per league:
+
+    LeagueID = "{league}{year}#TEAMS"   Teams [{TeamID, picks: [pick, ...]}, ...],
+                                        TeamIDs [TeamID, ...] (same order), UpdatedAt
+
+Teams are stored in TeamID order and picks in PickNumber order, so reads hand
+them back as-is in the helper.populate_teams_in_league shape. Written through
+by every route that changes picks so league reads don't regroup the draft;
+draft/pick appends to one team, locating it through TeamIDs. check_league_teams
+compares an item with the raw picks, run by the check_league_teams task.
+'''
+
+dynamodb = boto3.resource("dynamodb")
+meta_table = dynamodb.Table("wapit_meta")
+
+
+def _teams_key(league_key):
+    return {"LeagueID": f"{league_key}#TEAMS"}
+
+
+# {TeamID: [pick, ...]} - teams sorted by TeamID, picks by PickNumber
+def group_picks(picks):
+    teams = {}
+    for pick in sorted(picks, key=lambda p: (str(p["TeamID"]), int(p["PickNumber"]))):
+        teams.setdefault(pick["TeamID"], []).append(pick)
+    return teams
+
+
+# {TeamID: [pick, ...]} in stored order. None when the league has no rosters yet
+# (or only ones from before Teams was a list, which the callers rebuild)
+def read_league_teams(league_key):
+    item = meta_table.get_item(Key=_teams_key(league_key)).get("Item")
+    if item is None or not isinstance(item.get("Teams"), list):
+        return None
+    return {team["TeamID"]: team["picks"] for team in item["Teams"]}
+
+
+# Replace the league's rosters with the grouping of picks (the full draft)
+def write_league_teams(league_key, picks):
+    teams = group_picks(picks)
+    meta_table.put_item(Item={
+        **_teams_key(league_key),
+        "Teams": [{"TeamID": team_id, "picks": team_picks} for team_id, team_picks in teams.items()],
+        "TeamIDs": list(teams),
+        "UpdatedAt": datetime.now().isoformat(),
+    })
+    return teams
+
+
+# Appends a pick to its team's roster. Only valid for a pick numbered after every pick
+# the team has (draft/pick enforces that), so the roster stays in PickNumber order.
+# Returns False when the rosters need a rebuild instead: none yet, or no entry for the team
+def append_league_pick(league_key, pick):
+    item = meta_table.get_item(Key=_teams_key(league_key), ProjectionExpression="TeamIDs", ConsistentRead=True).get("Item")
+    team_ids = (item or {}).get("TeamIDs", [])
+    if pick["TeamID"] not in team_ids:
+        return False
+    index = team_ids.index(pick["TeamID"])
+    try:
+        meta_table.update_item(
+            Key=_teams_key(league_key),
+            UpdateExpression=f"SET Teams[{index}].picks = list_append(Teams[{index}].picks, :p), UpdatedAt = :u",
+            ConditionExpression=f"TeamIDs[{index}] = :t",
+            ExpressionAttributeValues={":p": [pick], ":t": pick["TeamID"], ":u": datetime.now().isoformat()},
+        )
+        return True
+    except meta_table.meta.client.exceptions.ConditionalCheckFailedException:
+        return False     # rewritten in between
+
+
+def delete_league_teams(league_key):
+    meta_table.delete_item(Key=_teams_key(league_key))
+
+
+# Differences between materialized rosters and the raw picks, [] when consistent
+def check_league_teams(materialized, picks):
+    expected = group_picks(picks)
+    if materialized is None:
+        return [{"issue": "missing", "teams": len(expected)}] if expected else []
+
+    def pick_numbers(team_picks):
+        return [int(p["PickNumber"]) for p in team_picks]
+
+    problems = []
+    for team_id in sorted(set(expected) | set(materialized), key=str):
+        have = pick_numbers(materialized.get(team_id, []))
+        want = pick_numbers(expected.get(team_id, []))
+        if have != want:
+            problems.append({"issue": "picks", "teamId": team_id, "materialized": have, "draft": want})
+        elif materialized[team_id] != expected[team_id]:
+            problems.append({"issue": "fields", "teamId": team_id})
+    return problems
@@ -3,17 +3,40 @@ import json
 import logging
 import urllib3
 import time
+import zlib
 import boto3
-from boto3.dynamodb.conditions import Key
-from datetime import datetime
-
-from utils.helper import get_users_in_group, populate_teams_in_league
+from botocore.config import Config
+from boto3.dynamodb.conditions import Key, Attr
+from datetime import datetime, date, timedelta
+
+from utils.helper import (
+    get_users_in_group, populate_teams_in_league, map_concurrently, run_with_deadline,
+    batch_write_concurrently, encode_cursor, decode_cursor, json_body_with, to_json, MAX_WORKERS
+)
+from utils.cache import cache_get, cache_set, cache_delete_prefix
+from utils.disk_cache import read_dataset, write_dataset, open_dataset, delete_dataset, CorruptDatasetError
+from utils.schools_index import SchoolsIndex
+from utils.wapit_player_pool import PlayerPool
+from utils.wapit_bracket import build_bracket
+from utils.wapit_stats import aggregate_player_stats, to_columnar
+from utils.wapit_scoring import scoring_rules_from_meta, rules_hash, score_league
+from api.wapit_stats_store import materialize_wapit_stats, read_materialized_stats, get_stats_meta, mark_stats_polled, to_item
+from api.wapit_games_store import poll_wapit_games, get_games_meta, read_changed_games
+from api.league_members import get_league_members, invalidate_league_members
+from api.league_teams import read_league_teams, write_league_teams, append_league_pick, check_league_teams
+from api.wapit_snapshot_store import read_snapshot, write_snapshot, SnapshotExistsError
+from api.wapit_chat_store import (
+    chat_key, chat_message, react, count_reactions, migrate_chat_partition,
+    read_chat_page, compact_chat_partition
+)
+from api.wapit_realtime import notify_league
 
 logging.basicConfig()
 logger = logging.getLogger(__name__)
 logger.setLevel(logging.INFO)
 
-http = urllib3.PoolManager()
+# Sized to the shared pool so concurrent fetches to one host reuse connections
+http = urllib3.PoolManager(maxsize=MAX_WORKERS)
 
 dynamodb_table_name      = "wapit_draft"
 dynamodb_meta_table_name = "wapit_meta"
@@ -21,11 +44,70 @@ dynamodb = boto3.resource("dynamodb")
 table = dynamodb.Table(dynamodb_table_name)
 meta_table = dynamodb.Table(dynamodb_meta_table_name)
 
-cognito = boto3.client("cognito-idp")
+# Picks are numbered from 1 (PickNumber is a number key). Chat lives under its own
+# "#CHAT" partition, so the range condition keeps every read to pick items only
+PICK_NUMBER_MIN = 1
+
+# Cognito is only read under LEAGUE_DEADLINE, so a call that misses it gives up soon
+# after instead of holding a worker for botocore's 60s timeouts and retries
+cognito = boto3.client("cognito-idp", config=Config(
+    connect_timeout=2, read_timeout=3, retries={"max_attempts": 2, "mode": "standard"}
+))
 
 NCAA_SCHOOLS_URL = "https://www.ncaa.com/json/schools"
 NCAA_API_URL = "https://data.ncaa.com/casablanca"
 NCAA_MM_LIVE_URL = "https://sdataprod.ncaa.com/"
+NCAA_MM_STATS_HASH = "0677d7ecf3cf630d58ed4f221c74908fb4494c12e0dacb70c45190d55accdc74"
+
+# Cache lifetimes (seconds)
+SCHOOLS_MEMORY_TTL = 24 * 60 * 60
+SCHOOLS_DISK_MAX_AGE = 7 * 24 * 60 * 60
+
+# Max names resolved by one bulk school lookup
+SCHOOL_LOOKUP_MAX_NAMES = 200
+
+# Schedule/scoreboard range limits and cache lifetime for today/future data
+SCHEDULE_RANGE_MAX_MONTHS = 12
+SCOREBOARD_RANGE_MAX_DAYS = 62
+LIVE_DATA_TTL = 60
+
+# Materialized WAPIT stats older than this are refreshed inline during a live season
+WAPIT_STATS_REFRESH_AFTER = 60
+
+# Leaderboards are cached per stats version, so this only bounds memory use
+LEADERBOARD_TTL = 60 * 60
+
+# Player pool lifetime during a live season (finished seasons never expire)
+WAPIT_POOL_TTL = 60 * 60
+
+# Columnar stats bodies are keyed by stats Version, the TTL only bounds memory for live seasons
+WAPIT_COLUMNAR_TTL = 60 * 60
+
+# Historical snapshots: how long a missing snapshot is remembered, and the response Cache-Control
+SNAPSHOT_MISS_TTL = 60 * 60
+SNAPSHOT_CACHE_CONTROL = {"Cache-Control": "public, max-age=31536000, immutable"}
+
+# Combined deadline for the concurrent league lookups (seconds)
+LEAGUE_DEADLINE = 3
+
+# Largest bulk draft diff applied as one DynamoDB transaction
+DRAFT_TRANSACTION_MAX_ITEMS = 100
+
+# Draft change long-poll: longest wait, meta re-read interval (doubling up to the max)
+# and time kept back from the Lambda deadline
+DRAFT_CHANGES_MAX_WAIT = 20
+DRAFT_CHANGES_POLL_INTERVAL = 0.5
+DRAFT_CHANGES_MAX_INTERVAL = 2
+DRAFT_CHANGES_DEADLINE_MARGIN = 2
+DRAFT_META_FIELDS = ("LeagueName", "Status", "DraftOrder", "TotalRounds", "DraftType", "retroMode", "DraftVersion", "NextPick")
+
+# Chat history page size cap, and how old messages get before compaction archives them
+CHAT_MAX_PAGE_SIZE = 100
+CHAT_COMPACT_AFTER_DAYS = 30
+
+# Game detail pages fetched per call
+GAME_MAX_PAGES = 10
+GAME_FINAL_STATES = {"final", "f"}
 
 class DateTimeEncoder(json.JSONEncoder):
     def default(self, obj):
@@ -33,12 +115,247 @@ class DateTimeEncoder(json.JSONEncoder):
             return obj.isoformat()  # e.g. "2024-01-15T10:30:00"
         return super().default(obj)
 
+# Load the NCAA schools list - memory cache, then /tmp, then ncaa.com
+def load_schools(logger):
+    schools = cache_get("ncaa:schools")
+    if schools is not None:
+        return schools
+
+    schools = read_dataset("ncaa_schools", max_age=SCHOOLS_DISK_MAX_AGE)
+    if schools is None:
+        response = http.request("GET", NCAA_SCHOOLS_URL)
+        logger.info(f"[ncaa.py / load_schools] - Response Code: {response.status}")
+        schools = json.loads(response.data)
+
+        # One record per school, keyed by slug so single schools can be read back alone
+        seen = set()
+        records = []
+        for i, school in enumerate(schools):
+            key = school.get("slug") or str(i)
+            key = key if key not in seen else f"{key}#{i}"
+            seen.add(key)
+            records.append((key, school))
+        write_dataset("ncaa_schools", records)
+
+    return cache_set("ncaa:schools", schools, ttl=SCHOOLS_MEMORY_TTL)
+
+# One school by slug. Uses the index when this container already built it, otherwise
+# decodes just that school's record from /tmp instead of the whole list
+def load_school(slug, logger):
+    index = cache_get("ncaa:schools-index")
+    if index is not None:
+        return index.get_by_seo(slug)
+
+    dataset = open_dataset("ncaa_schools", max_age=SCHOOLS_DISK_MAX_AGE)
+    if dataset is not None:
+        try:
+            return dataset.get(slug.lower())
+        except (CorruptDatasetError, zlib.error, ValueError) as e:
+            logger.warning(f"[ncaa.py / load_school({slug})] - Discarding schools dataset: {e}")
+            delete_dataset("ncaa_schools")
+        finally:
+            dataset.close()
+
+    return load_schools_index(logger).get_by_seo(slug)
+
+# Build the schools index once per cached schools payload
+def load_schools_index(logger):
+    index = cache_get("ncaa:schools-index")
+    if index is None:
+        index = cache_set("ncaa:schools-index", SchoolsIndex(load_schools(logger)), ttl=SCHOOLS_MEMORY_TTL)
+    return index
+
+# Resolve a school reference (name, variant or slug) to its SEO name, None if unknown
+def resolve_school_seo(school, logger):
+    try:
+        resolved, _ = load_schools_index(logger).resolve(school)
+        return resolved.get("slug") if resolved else None
+    except Exception as e:
+        logger.warning(f"[ncaa.py / resolve_school_seo({school})] - Schools index unavailable: {e}")
+        return None
+
+# Does an mmlContests team belong to the given school
+def is_same_school(team, school, school_seo=None):
+    if school_seo is not None and team.get("seoname") == school_seo:
+        return True
+    return team.get("nameFull") == school
+
+# A tournament year is frozen once its season is over (the title game is in early April)
+def is_historical_season(year):
+    now = datetime.now()
+    return int(year) < now.year or (int(year) == now.year and now.month > 4)
+
+# Frozen WAPIT data for a finished season: {"contests", "players", "stats", "version"}
+# Memory, then /tmp, then one DynamoDB query. None for live seasons or years never snapshotted
+def load_wapit_snapshot(year, logger):
+    if not is_historical_season(year):
+        return None
+
+    cache_key = f"ncaa:wapit_snapshot:{year}"
+    snapshot = cache_get(cache_key)
+    if snapshot is not None:
+        return snapshot or None
+
+    dataset = read_dataset(f"wapit_snapshot_{year}")
+    if dataset:
+        return cache_set(cache_key, dataset[0])
+
+    header, snapshot = read_snapshot(year)
+    if snapshot is None:
+        cache_set(cache_key, False, ttl=SNAPSHOT_MISS_TTL)
+        return None
+
+    logger.info(f"[ncaa.py / load_wapit_snapshot({year})] - Loaded snapshot ({header['Bytes']} bytes, {header['Chunks']} chunks)")
+    snapshot = {**snapshot, "version": header["Version"]}
+    write_dataset(f"wapit_snapshot_{year}", [("snapshot", snapshot)], meta={"year": year})
+    return cache_set(cache_key, snapshot)
+
+# Responses built only from a snapshot never change, let clients and CDNs keep them
+def snapshot_headers(year, logger):
+    return SNAPSHOT_CACHE_CONTROL if load_wapit_snapshot(year, logger) is not None else None
+
+# Load all March Madness contests (with rosters and boxscores) for a tournament year
+# Finished seasons are kept in memory and in /tmp, live seasons always hit the API
+def load_mml_contests(year, logger):
+    LOGGER_CONTEXT = f"[ncaa.py / load_mml_contests({year})]"
+    historical = is_historical_season(year)
+    cache_key = f"ncaa:mml:{year}"
+
+    if historical:
+        contests = cache_get(cache_key)
+        if contests is not None:
+            return contests
+
+        snapshot = load_wapit_snapshot(year, logger)
+        if snapshot is not None:
+            return cache_set(cache_key, snapshot["contests"])
+
+        contests = read_dataset(f"mml_contests_{year}")
+        if contests is not None:
+            logger.info(f"{LOGGER_CONTEXT} - Loaded {len(contests)} contests from disk cache")
+            return cache_set(cache_key, contests)
+
+    #URL --- https://sdataprod.ncaa.com/?operationName=gamecenter_game_stats_web&variables={"seasonYear":2024}&extensions={"persistedQuery":{"version":1,"sha256Hash":"0677d7ecf3cf630d58ed4f221c74908fb4494c12e0dacb70c45190d55accdc74"}}
+    response = http.request(
+        "GET",
+        f"{NCAA_MM_LIVE_URL}?operationName=gamecenter_game_stats_web&variables=%7B%22seasonYear%22:{int(year)-1}%7D&extensions=%7B%22persistedQuery%22:%7B%22version%22:1,%22sha256Hash%22:%22{NCAA_MM_STATS_HASH}%22%7D%7D"
+    )
+
+    logger.info(f"{LOGGER_CONTEXT} - Response Status:")
+    logger.info(response.status)
+
+    contests = json.loads(response.data)["data"]["mmlContests"]
+
+    if historical:
+        write_dataset(
+            f"mml_contests_{year}",
+            ((game["contestId"], game) for game in contests),
+            meta={"year": year}
+        )
+        cache_set(cache_key, contests)
+
+    return contests
+
+# Every pick of a league ({league_id}{year}), following LastEvaluatedKey page by page
+# attributes limits the read to those attributes (ProjectionExpression)
+# since_version keeps only picks written by draft/pick after that DraftVersion
+# consistent reads with ConsistentRead, for callers that must see writes made just before
+def iter_draft_picks(league_key, attributes=None, since_version=None, consistent=False):
+    kwargs = {
+        "KeyConditionExpression": Key("LeagueID").eq(league_key) & Key("PickNumber").gte(PICK_NUMBER_MIN),
+        "ConsistentRead": consistent,
+    }
+    if since_version is not None:
+        kwargs["FilterExpression"] = Attr("Version").gt(since_version)
+    if attributes:
+        names = {f"#a{i}": attribute for i, attribute in enumerate(attributes)}
+        kwargs["ProjectionExpression"] = ", ".join(names)
+        kwargs["ExpressionAttributeNames"] = names
+
+    while True:
+        response = table.query(**kwargs)
+        yield from response.get("Items", [])
+        if "LastEvaluatedKey" not in response:
+            break
+        kwargs["ExclusiveStartKey"] = response["LastEvaluatedKey"]
+
+# Rebuild a league's materialized rosters from its picks, read consistently so a pick
+# written just before is not dropped. Callers holding the post-write picks use write_league_teams
+def refresh_league_teams(league_key):
+    return write_league_teams(league_key, list(iter_draft_picks(league_key, consistent=True)))
+
+# Every league key in wapit_meta (skips the "#MEMBERS"/"#TEAMS" companion items)
+def iter_league_keys():
+    kwargs = {"ProjectionExpression": "LeagueID"}
+    while True:
+        response = meta_table.scan(**kwargs)
+        for item in response.get("Items", []):
+            if "#" not in item["LeagueID"]:
+                yield item["LeagueID"]
+        if "LastEvaluatedKey" not in response:
+            break
+        kwargs["ExclusiveStartKey"] = response["LastEvaluatedKey"]
+
+# One-time task: {"task": "backfill_league_teams"} or {"task": ..., "league_key": "abc2025"}
+# Builds materialized rosters for existing leagues
+def run_backfill_league_teams(event, logger):
+    LOGGER_CONTEXT = "[ncaa.py / run_backfill_league_teams]"
+    league_keys = [event["league_key"]] if event.get("league_key") else list(iter_league_keys())
+    for league_key in league_keys:
+        teams = refresh_league_teams(league_key)
+        logger.info(f"{LOGGER_CONTEXT} - {league_key}: {len(teams)} teams")
+    return 200, {"leagues": len(league_keys)}
+
+# Task: {"task": "check_league_teams", "league_key": "abc2025" (optional), "repair": false}
+# Compares materialized rosters with the raw picks, optionally rebuilding the ones that drifted
+def run_check_league_teams(event, logger):
+    LOGGER_CONTEXT = "[ncaa.py / run_check_league_teams]"
+    league_keys = [event["league_key"]] if event.get("league_key") else list(iter_league_keys())
+    inconsistent = {}
+    for league_key in league_keys:
+        picks = list(iter_draft_picks(league_key))
+        problems = check_league_teams(read_league_teams(league_key), picks)
+        if problems:
+            inconsistent[league_key] = problems
+            logger.warning(f"{LOGGER_CONTEXT} - {league_key} rosters differ from picks: {problems}")
+            if event.get("repair"):
+                write_league_teams(league_key, picks)
+    return 200, {
+        "checked": len(league_keys),
+        "inconsistent": inconsistent,
+        "repaired": bool(event.get("repair")) and len(inconsistent) > 0
+    }
+
+# One-time task: {"task": "migrate_chat_reactions"} or {"task": ..., "league_key": "abc2025"}
+# Converts map-shaped chat reactions to per-emoji sets
+def run_migrate_chat_reactions(event, logger):
+    LOGGER_CONTEXT = "[ncaa.py / run_migrate_chat_reactions]"
+    league_keys = [event["league_key"]] if event.get("league_key") else list(iter_league_keys())
+    migrated = 0
+    for league_key in league_keys:
+        count = migrate_chat_partition(league_key)
+        logger.info(f"{LOGGER_CONTEXT} - {league_key}: {count} messages")
+        migrated += count
+    return 200, {"leagues": len(league_keys), "migrated": migrated}
+
+# Task: {"task": "compact_wapit_chat", "league_key": "abc2025" (optional), "older_than_days": 30}
+# Rolls chat messages from before the cutoff day into archive blocks, see api/wapit_chat_store.py
+def run_compact_wapit_chat(event, logger):
+    LOGGER_CONTEXT = "[ncaa.py / run_compact_wapit_chat]"
+    league_keys = [event["league_key"]] if event.get("league_key") else list(iter_league_keys())
+    cutoff_day = (date.today() - timedelta(days=int(event.get("older_than_days", CHAT_COMPACT_AFTER_DAYS)))).isoformat()
+    archived = 0
+    for league_key in league_keys:
+        result = compact_chat_partition(league_key, cutoff_day)
+        if result["messages"]:
+            logger.info(f"{LOGGER_CONTEXT} - {league_key}: {result['messages']} messages over {result['days']} days")
+        archived += result["messages"]
+    return 200, {"leagues": len(league_keys), "cutoff": cutoff_day, "archived": archived}
+
 # Get NCAA schools
 def get_schools(event, logger):
     try:
-        response = http.request("GET", NCAA_SCHOOLS_URL)
-        print("Response Code:", response.status)
-        data = json.loads(response.data)
+        data = load_schools(logger)
 
         body = {
             "schools": data
@@ -49,6 +366,64 @@ def get_schools(event, logger):
         logger.exception("Exception in Get Schools method !!")
         logger.exception(e)
         return 500, {"error": "Server error"}
+
+# Resolve school references against the schools index
+def lookup_schools(index, params, names):
+    results = {}
+    for key, getter in (("id", index.get_by_id), ("seo", index.get_by_seo)):
+        if params.get(key):
+            school = getter(params[key])
+            results[params[key]] = {"school": school, "match": key if school else None}
+
+    for name in names:
+        school, match = index.resolve(name)
+        results[name] = {"school": school, "match": match}
+
+    return results
+
+# GET /ncaa/schools/lookup?id=&seo=&name=
+# GET /ncaa/schools/lookup?names=Duke,Michigan St.,UConn
+def get_school_lookup(event, logger):
+    try:
+        params = event.get("queryStringParameters") or {}
+        names = [n.strip() for n in params.get("names", "").split(",") if n.strip()]
+        if params.get("name"):
+            names.append(params["name"])
+
+        if not names and not params.get("id") and not params.get("seo"):
+            return 400, {"error": "Missing id, seo, name or names in query string"}
+        if len(names) > SCHOOL_LOOKUP_MAX_NAMES:
+            return 400, {"error": f"At most {SCHOOL_LOOKUP_MAX_NAMES} names per lookup"}
+
+        # A lone seo lookup reads one record instead of loading every school
+        if not names and not params.get("id"):
+            school = load_school(params["seo"], logger)
+            return 200, {"results": {params["seo"]: {"school": school, "match": "seo" if school else None}}}
+
+        results = lookup_schools(load_schools_index(logger), params, names)
+        return 200, {"results": results}
+    except Exception as e:
+        logger.exception("Exception in Get School Lookup method !!")
+        logger.exception(e)
+        return 500, {"error": "Server error"}
+
+# POST /ncaa/schools/lookup   body: {"names": ["Duke", "Michigan St.", ...]}
+def post_school_lookup(event, logger):
+    try:
+        body = json.loads(event.get("body") or "{}")
+        names = [str(n) for n in body.get("names", []) if str(n).strip()]
+
+        if not names:
+            return 400, {"error": "Missing names in request body"}
+        if len(names) > SCHOOL_LOOKUP_MAX_NAMES:
+            return 400, {"error": f"At most {SCHOOL_LOOKUP_MAX_NAMES} names per lookup"}
+
+        results = lookup_schools(load_schools_index(logger), {}, names)
+        return 200, {"results": results}
+    except Exception as e:
+        logger.exception("Exception in Post School Lookup method !!")
+        logger.exception(e)
+        return 500, {"error": "Server error"}
         
 # Get NCAA Game Schedule for a Sport/Division/Year/Month
 def get_schedule(event, logger):
@@ -93,28 +468,229 @@ def get_scoreboard(event, logger):
         logger.exception(e)
         return 500, {"error": "Server Error"}
 
-# Get NCAA Game Details for a Game/Page
+# GET a JSON document from the NCAA data API
+# Days/games without data 404 upstream, those come back as {}
+def request_ncaa_json(url, logger):
+    response = http.request("GET", url)
+    logger.info(f"[ncaa.py / request_ncaa_json] - {url} Response Code: {response.status}")
+    if response.status == 404:
+        return {}
+    if response.status != 200:
+        raise Exception(f"NCAA API returned {response.status} for {url}")
+    return json.loads(response.data)
+
+# GET a JSON document from the NCAA data API through the cache tiers
+# ttl=None marks data that can no longer change - it is also persisted to /tmp
+def fetch_ncaa_json(url, cache_key, ttl, logger):
+    data = cache_get(cache_key)
+    if data is not None:
+        return data
+
+    if ttl is None:
+        stored = read_dataset(cache_key)
+        if stored:
+            return cache_set(cache_key, stored[0])
+
+    data = request_ncaa_json(url, logger)
+
+    if ttl is None:
+        write_dataset(cache_key, [("data", data)])
+    return cache_set(cache_key, data, ttl=ttl)
+
+# Parse a From/To query parameter (YYYY-MM-DD or YYYYMMDD)
+def parse_range_date(value):
+    return datetime.strptime(value.replace("-", "").replace("/", ""), "%Y%m%d").date()
+
+# Read and validate From/To, returns (from_date, to_date, error)
+def get_date_range(event):
+    params = event.get("queryStringParameters") or {}
+    if not params.get("From") or not params.get("To"):
+        return None, None, (400, {"error": "Missing From or To in query string"})
+    try:
+        from_date = parse_range_date(params["From"])
+        to_date = parse_range_date(params["To"])
+    except ValueError:
+        return None, None, (400, {"error": "From and To must be YYYY-MM-DD dates"})
+    if from_date > to_date:
+        return None, None, (400, {"error": "From must be on or before To"})
+    return from_date, to_date, None
+
+# Get NCAA Game Schedule for a Sport/Division across a date range
+# GET /ncaa/schedule/range?Sport=basketball-men&Division=d1&From=2025-11-01&To=2026-04-10
+def get_schedule_range(event, logger):
+    try:
+        params = event.get("queryStringParameters") or {}
+        sport = params.get("Sport", "football")
+        division = params.get("Division", "fbs")
+        from_date, to_date, err = get_date_range(event)
+        if err:
+            return err
+
+        # One schedule fetch per month touched by the range
+        months = []
+        month = from_date.replace(day=1)
+        while month <= to_date:
+            months.append(month)
+            month = (month + timedelta(days=32)).replace(day=1)
+        if len(months) > SCHEDULE_RANGE_MAX_MONTHS:
+            return 400, {"error": f"Range can span at most {SCHEDULE_RANGE_MAX_MONTHS} months"}
+
+        current_month = date.today().replace(day=1)
+
+        def fetch_month(month):
+            return fetch_ncaa_json(
+                f"{NCAA_API_URL}/schedule/{sport}/{division}/{month.year}/{month.month:02d}/schedule-all-conf.json",
+                f"ncaa_schedule_{sport}_{division}_{month:%Y%m}",
+                None if month < current_month else LIVE_DATA_TTL,
+                logger
+            )
+
+        # Keep only the game dates inside the range, oldest first
+        game_dates = []
+        for data in map_concurrently(fetch_month, months):
+            for game_date in data.get("gameDates", []):
+                try:
+                    contest_date = datetime.strptime(game_date["contest_date"], "%m/%d/%Y").date()
+                except (KeyError, ValueError):
+                    continue
+                if from_date <= contest_date <= to_date:
+                    game_dates.append((contest_date, game_date))
+        game_dates.sort(key=lambda x: x[0])
+
+        body = {
+            "from": from_date.isoformat(),
+            "to": to_date.isoformat(),
+            "schedule": {"gameDates": [game_date for _, game_date in game_dates]}
+        }
+
+        return 200, body
+    except Exception as e:
+        logger.exception("Exception in Get Schedule Range method !!")
+        logger.exception(e)
+        return 500, {"error": "Server error"}
+
+# Get NCAA Scoreboards for a Sport/Division across a date range
+# GET /ncaa/scoreboard/range?Sport=basketball-men&Division=d1&From=2026-03-19&To=2026-03-22
+def get_scoreboard_range(event, logger):
+    try:
+        params = event.get("queryStringParameters") or {}
+        sport = params.get("Sport", "football")
+        division = params.get("Division", "fbs")
+        from_date, to_date, err = get_date_range(event)
+        if err:
+            return err
+
+        days = [from_date + timedelta(days=i) for i in range((to_date - from_date).days + 1)]
+        if len(days) > SCOREBOARD_RANGE_MAX_DAYS:
+            return 400, {"error": f"Range can span at most {SCOREBOARD_RANGE_MAX_DAYS} days"}
+
+        today = date.today()
+
+        def fetch_day(day):
+            return fetch_ncaa_json(
+                f"{NCAA_API_URL}/scoreboard/{sport}/{division}/{day:%Y/%m/%d}/scoreboard.json",
+                f"ncaa_scoreboard_{sport}_{division}_{day:%Y%m%d}",
+                None if day < today else LIVE_DATA_TTL,
+                logger
+            )
+
+        # Results come back in input order, so days stay date ordered
+        scoreboards = map_concurrently(fetch_day, days)
+        body = {
+            "from": from_date.isoformat(),
+            "to": to_date.isoformat(),
+            "scoreboards": [
+                {"date": day.isoformat(), "games": data.get("games", [])}
+                for day, data in zip(days, scoreboards)
+            ]
+        }
+
+        return 200, body
+    except Exception as e:
+        logger.exception("Exception in Get Scoreboard Range method !!")
+        logger.exception(e)
+        return 500, {"error": "Server Error"}
+
+# Look for a final game state in any of the fetched game pages
+def is_game_final(pages):
+    for data in pages.values():
+        if not isinstance(data, dict):
+            continue
+        for holder in (data, data.get("meta") or {}, data.get("game") or {}, data.get("status") or {}):
+            if not isinstance(holder, dict):
+                continue
+            for key in ("gameState", "status", "state"):
+                value = holder.get(key)
+                if isinstance(value, str) and value.lower() in GAME_FINAL_STATES:
+                    return True
+    return False
+
+# Get NCAA Game Details for a Game/Page(s)
+# GET /ncaa/game?GameID=6305900&Page=boxscore
+# GET /ncaa/game?GameID=6305900&Pages=boxscore,playbyplay,teamStats
 def get_game_details(event, logger):
     try:
-        game_id = event.get("queryStringParameters", {}).get("GameID", None)
-        page = event.get("queryStringParameters", {}).get("Page", "summary") # summary, playbyplay, boxscore
+        params = event.get("queryStringParameters") or {}
+        game_id = params.get("GameID", None)
+        page = params.get("Page", "summary") # summary, playbyplay, boxscore
+        pages_param = params.get("Pages", params.get("pages"))
         if game_id is None:
             return 400, {"error": "Missing GameID in query string"}
 
-        response = http.request("GET", f"{NCAA_API_URL}/game/{game_id}/{page}.json")
-        print("Response Code:", response.status)
-        data = json.loads(response.data)
+        pages = list(dict.fromkeys(p.strip() for p in pages_param.split(",") if p.strip())) if pages_param else [page]
+        if not pages or len(pages) > GAME_MAX_PAGES:
+            return 400, {"error": f"Pages must list 1 to {GAME_MAX_PAGES} page names"}
+        if not all(p.replace("_", "").replace("-", "").isalnum() for p in [game_id, *pages]):
+            return 400, {"error": "Invalid GameID or page name"}
+
+        # Cached per game: {"final": bool, "pages": {page: data}, "fetchedAt": {page: ts}}
+        # Live games keep pages for LIVE_DATA_TTL, final games keep them for good
+        cache_key = f"ncaa_game_{game_id}"
+        entry = cache_get(cache_key)
+        if entry is None:
+            stored = read_dataset(cache_key)
+            if stored:
+                # Only final games are written to /tmp, keep them in memory from here on
+                entry = cache_set(cache_key, stored[0])
+            else:
+                entry = {"final": False, "pages": {}, "fetchedAt": {}}
+
+        now = time.time()
+        missing = [
+            p for p in pages
+            if p not in entry["pages"] or (not entry["final"] and now - entry["fetchedAt"].get(p, 0) > LIVE_DATA_TTL)
+        ]
+
+        pages_data = entry["pages"]
+        if missing:
+            fetched = map_concurrently(
+                lambda p: request_ncaa_json(f"{NCAA_API_URL}/game/{game_id}/{p}.json", logger),
+                missing
+            )
+            fresh = dict(zip(missing, fetched))
+            pages_data = {**entry["pages"], **fresh}
+            fetched_at = {**entry["fetchedAt"], **{p: now for p in missing}}
+
+            if entry["final"] or is_game_final(fresh):
+                # Only pages fetched after the final whistle are kept for good
+                kept = pages_data if entry["final"] else fresh
+                entry = {"final": True, "pages": kept, "fetchedAt": {p: fetched_at[p] for p in kept}}
+                write_dataset(cache_key, [("entry", entry)], meta={"gameId": game_id})
+                cache_set(cache_key, entry)
+            else:
+                entry = {"final": False, "pages": pages_data, "fetchedAt": fetched_at}
+                cache_set(cache_key, entry, ttl=LIVE_DATA_TTL)
 
         body = {
-            page: data
+            p: pages_data[p] for p in pages
         }
 
         return 200, body
     except Exception as e:
-        logger.exception("Exception in Get Scoreboard method !!")
+        logger.exception("Exception in Get Game Details method !!")
         logger.exception(e)
         return 500, {"error": "Server Error"}
-    
+
 
 # Get NCAA March Madness WAPIT stats for a player
 def get_wapit_stats(event, logger):
@@ -133,16 +709,8 @@ def get_wapit_stats(event, logger):
 
         logger.info(f"{LOGGER_CONTEXT} - Getting all boxscores for ")
 
-        response = http.request(
-            "GET", 
-            f"{NCAA_MM_LIVE_URL}?operationName=gamecenter_game_stats_web&variables=%7B%22seasonYear%22:{int(year)-1}%7D&extensions=%7B%22persistedQuery%22:%7B%22version%22:1,%22sha256Hash%22:%220677d7ecf3cf630d58ed4f221c74908fb4494c12e0dacb70c45190d55accdc74%22%7D%7D"
-        )
-
-        logger.info(f"{LOGGER_CONTEXT} - Response Status:")
-        logger.info(response.status)
-
         # Get all March Madness games
-        game_stats = json.loads(response.data)["data"]["mmlContests"]
+        game_stats = load_mml_contests(year, logger)
         #logger.info(f"{LOGGER_CONTEXT} - Game Stats:")
         #logger.info(game_stats)
 
@@ -152,7 +720,8 @@ def get_wapit_stats(event, logger):
         # Filter only completed games
         # Filter games for school of given player
         filtered_games = [game for game in game_stats if (game["gameState"] != "P" and game["round"]["roundNumber"] > 1)]
-        player_games = [game for game in filtered_games if game["teams"][0]["nameFull"] == school or game["teams"][1]["nameFull"] == school]
+        school_seo = resolve_school_seo(school, logger)
+        player_games = [game for game in filtered_games if any(is_same_school(t, school, school_seo) for t in game["teams"])]
         
         # Loop through games and compile stats for given player
         player_stats = []
@@ -163,8 +732,9 @@ def get_wapit_stats(event, logger):
             filtered_game = {k: v for k, v in game.items() if k in keys_to_keep}
 
             # Only keep the player stats for the given player
+            school_org_id = next(t["ncaaOrgId"] for t in game["teams"] if is_same_school(t, school, school_seo))
             for team in game["boxscore"]["teamBoxscore"]:
-                if (team["nameFull"] == school):
+                if (team["ncaaOrgId"] == school_org_id):
                     for player in team["playerStats"]:
                         if (player["num"] == int(number) and f"{player['fname']} {player['lname']}" == player_name):
                             filtered_game["playerStats"] = player
@@ -172,7 +742,7 @@ def get_wapit_stats(event, logger):
             # Assign "team" and "opponent"
             for team in game["teams"]:
                 filtered_team = {k: v for k, v in team.items() if k != "roster"}
-                if (filtered_team["nameFull"] == school):
+                if is_same_school(filtered_team, school, school_seo):
                     filtered_game["team"] = filtered_team
                 else:
                     filtered_game["opponent"] = filtered_team
@@ -196,99 +766,177 @@ def get_wapit_stats(event, logger):
             "stats": player_stats
         }
 
-        return 200, body
+        return 200, body, snapshot_headers(year, logger)
     except Exception as e:
         logger.exception("Exception in Get Scoreboard method !!")
         logger.exception(e)
         return 500, {"error": "Server Error"}
 
 
+# {player id (str): player + school fields + boxscores[]} for every counted game
+# One fetch/parse of the contests per year, live seasons are rebuilt after LIVE_DATA_TTL
+def load_wapit_stats_index(year, logger):
+    cache_key = f"ncaa:wapit_index:{year}"
+    index = cache_get(cache_key)
+    if index is None:
+        snapshot = load_wapit_snapshot(year, logger)
+        stats = snapshot["stats"] if snapshot else aggregate_player_stats(load_mml_contests(year, logger))
+        index = {str(player_id): entry for player_id, entry in stats.items()}
+        cache_set(cache_key, index, ttl=None if is_historical_season(year) else LIVE_DATA_TTL)
+    return index
+
+# GET /ncaa/wapit/stats/players?year=2025&ids=123,456
+# GET /ncaa/wapit/stats/players?year=2025&league_id=abc&team_id=xyz
+# Box scores for several players (a list of ids, or one team's picks) from a single load
+def get_wapit_stats_bulk(event, logger):
+    LOGGER_CONTEXT = "[ncaa.py / get_wapit_stats_bulk]"
+    try:
+        params = event.get("queryStringParameters") or {}
+        year = params.get("year", str(datetime.now().year))
+        ids = [i.strip() for i in params.get("ids", "").split(",") if i.strip()]
+        league_id = params.get("league_id")
+        team_id = params.get("team_id")
+
+        if not ids and not (league_id and team_id):
+            return 400, {"error": "Provide ids or league_id and team_id in query string"}
+        if ids and league_id:
+            return 400, {"error": "Provide either ids or league_id and team_id, not both"}
+
+        start_time = time.time()
+
+        # A team's players are its draft picks
+        if not ids:
+            ids = [
+                str(i["PlayerID"]) for i in iter_draft_picks(league_id + year, ["TeamID", "PlayerID"])
+                if str(i.get("TeamID")) == team_id and i.get("PlayerID") is not None
+            ]
+
+        index = load_wapit_stats_index(year, logger)
+        ids = list(dict.fromkeys(ids))
+        players = {player_id: index[player_id] for player_id in ids if player_id in index}
+        missing = [player_id for player_id in ids if player_id not in index]
+
+        elapsed_time = time.time() - start_time
+        logger.info(f"{LOGGER_CONTEXT} - {len(players)} of {len(ids)} players found for {year} in {elapsed_time:.4f} seconds")
+
+        # A team's picks can change, only explicit ids are cacheable
+        headers = None if league_id else snapshot_headers(year, logger)
+
+        return 200, {
+            "timeElapsed": elapsed_time,
+            "year": year,
+            "leagueId": league_id,
+            "teamId": team_id,
+            "players": players,
+            "missing": missing
+        }, headers
+    except Exception as e:
+        logger.exception(f"{LOGGER_CONTEXT} - Exception")
+        logger.exception(e)
+        return 500, {"error": "Server Error"}
+
+
+# Finished seasons only need a refresh while games were still in progress at the last run
+def is_wapit_stats_stale(year, meta):
+    if meta is None:
+        return True
+    if is_historical_season(year):
+        return meta.get("LiveHash") != zlib.crc32(b"{}")
+    # The live poller stamps PolledAt when it found nothing new
+    checked_at = max(datetime.fromisoformat(meta[k]) for k in ("UpdatedAt", "PolledAt") if meta.get(k))
+    return (datetime.now() - checked_at).total_seconds() > WAPIT_STATS_REFRESH_AFTER
+
+# Scheduled task: {"task": "materialize_wapit_stats", "year": "2026"}
+# Folds newly final games into the materialized stats store
+def run_materialize_wapit_stats(event, logger):
+    year = str(event.get("year", datetime.now().year))
+    return 200, materialize_wapit_stats(year, load_mml_contests(year, logger), logger)
+
+# Manual task: {"task": "snapshot_wapit_season", "year": "2024"}
+# Freezes a finished season's contests, player pool and materialized stats
+def run_snapshot_wapit_season(event, logger):
+    LOGGER_CONTEXT = "[ncaa.py / run_snapshot_wapit_season]"
+    year = str(event.get("year", ""))
+    if not year.isdigit() or not is_historical_season(year):
+        return 400, {"error": "year must be a finished season"}
+
+    contests = load_mml_contests(year, logger)
+    meta, stats = read_materialized_stats(year)
+    if is_wapit_stats_stale(year, meta):
+        materialize_wapit_stats(year, contests, logger)
+        meta, stats = read_materialized_stats(year)
+
+    artifact = {
+        "contests": contests,
+        "players": PlayerPool.from_contests(contests).players,
+        "stats": stats,
+    }
+    try:
+        header = write_snapshot(year, artifact, meta["Version"])
+    except SnapshotExistsError as e:
+        return 409, {"error": str(e)}
+
+    cache_delete_prefix(f"ncaa:wapit_snapshot:{year}")
+    logger.info(f"{LOGGER_CONTEXT} - Snapshot for {year}: {header['Bytes']} bytes in {header['Chunks']} chunks")
+    return 201, {"year": year, "bytes": header["Bytes"], "chunks": header["Chunks"], "version": header["Version"]}
+
+# Store the games whose state, score or box score changed, then rebuild the stats
+# whenever they were built from an older GAMES version than the one now stored.
+# Going by versions rather than this poll's diff catches up after a failed
+# materialize or after another writer stored the change first
+def refresh_wapit_games(year, logger):
+    contests = load_mml_contests(year, logger)
+    summary = poll_wapit_games(year, contests, logger)
+
+    stats_meta = get_stats_meta(year)
+    if stats_meta is None or int(stats_meta.get("GamesVersion", -1)) < summary["version"]:
+        summary["stats"] = materialize_wapit_stats(year, contests, logger, games_version=summary["version"])
+    else:
+        mark_stats_polled(year)
+    return summary
+
+# Scheduled task: {"task": "poll_wapit_games", "year": "2026"}
+# Finished seasons never change, so those polls return without touching the store
+def run_poll_wapit_games(event, logger):
+    year = str(event.get("year", datetime.now().year))
+    if is_historical_season(year):
+        return 200, {"year": year, "skipped": "season is over"}
+    return 200, refresh_wapit_games(year, logger)
+
+# Serialized to_columnar for one stats Version, built once per container
+def load_wapit_columnar(year, version, player_stats):
+    cache_key = f"ncaa:wapit_columnar:{year}:{version}"
+    columnar = cache_get(cache_key)
+    if columnar is None:
+        ttl = None if is_historical_season(year) else WAPIT_COLUMNAR_TTL
+        columnar = cache_set(cache_key, to_json(to_columnar(player_stats)), ttl=ttl)
+    return columnar
+
 # Get NCAA March Madness WAPIT stats for an entire league
 def get_all_wapit_stats(event, logger):
     logger.info("[ncaa.py / get_all_wapit_stats] - In Get All WAPIT Stats!!!")
     try:
         year = event.get("queryStringParameters", {}).get("year", str(datetime.now().year))
+        response_format = event.get("queryStringParameters", {}).get("format", "default")
         LOGGER_CONTEXT = f"[ncaa.py / get_all_wapit_stats({year})]"
         if year is None:
             return 400, {"error": "Missing year in query string"}
+        if response_format not in ("default", "columnar"):
+            return 400, {"error": "format must be default or columnar"}
         
         start_time = time.time()
 
-        logger.info(f"{LOGGER_CONTEXT} - Getting all boxscores for ")
-
-        game_response = http.request(
-            "GET", 
-            f"{NCAA_MM_LIVE_URL}?operationName=gamecenter_game_stats_web&variables=%7B%22seasonYear%22:{int(year)-1}%7D&extensions=%7B%22persistedQuery%22:%7B%22version%22:1,%22sha256Hash%22:%220677d7ecf3cf630d58ed4f221c74908fb4494c12e0dacb70c45190d55accdc74%22%7D%7D"
-        )
-
-        logger.info(f"{LOGGER_CONTEXT} - Response Status:")
-        logger.info(game_response.status)
-
-        # Get all March Madness games
-        game_stats = json.loads(game_response.data)["data"]["mmlContests"]
-
-        # Filter out any pending games and first four games
-        filtered_games = [game for game in game_stats if (game["gameState"] != "P" and game["round"]["roundNumber"] > 1)]
-
-        # Loop through games and compile stats for all wapit players
-        player_stats = {}
-        for game in filtered_games:
-            # Only keep the below fields from games list
-            keys_to_keep = {"bracketId", "contestId", "startDate", "broadcaster", 
-                            "condensedVideo", "location", "region", "round", "teams"}
-            filtered_game = {k: v for k, v in game.items() if k in keys_to_keep}
-
-            # Only keep the player stats for the given player
-            print("GAME:", game["bracketId"], game["teams"][0]["nameShort"], game["teams"][1]["nameShort"])
-            for team in game["teams"]:
-                for player in team["roster"]:
-                    # If ID doesn't exist in player_stats, create it and assign the game to an empty list
-                    # stats will be list of dicts
-                    #print("PLAYER: ", player["id"], player["firstName"] + " " + player["lastName"])
-                    #print("Team:", team)
-                    #print("Team Boxscore:", game["boxscore"]["teamBoxscore"])
-
-                    player_team_boxscore = next((t for t in game["boxscore"]["teamBoxscore"] if t["ncaaOrgId"] == team["ncaaOrgId"]), None)
-                    player_boxscore = next((p for p in player_team_boxscore["playerStats"] if (p["fname"] + " " + p["lname"]) == (player["firstName"] + " " + player["lastName"])), None)    
-                    
-                    if (not player_boxscore):
-                        #print("SKIPPING ", player["id"], player["firstName"] + " " + player["lastName"])
-                        continue
-
-                    if player["id"] not in player_stats:
-                        # Initialize player in player_stats
-                        player_stats[player["id"]] = {
-                            **player,
-                            "schoolColor": team["color"],
-                            "seed": team["seed"],
-                            "schoolNameFull": team["nameFull"],
-                            "schoolNameShort": team["nameShort"],
-                            "schoolName6Char": team["name6Char"],
-                            "schoolSeoName": team["seoname"],
-                            "schoolNickname": team["nickname"],
-                            "boxscores": [{
-                                "bracketId": game["bracketId"],
-                                "contestId": game["contestId"],
-                                "roundName": game["round"]["title"],
-                                "startDate": game["startDate"],
-                                "gameState": game["gameState"],
-                                "isWinner": team["isWinner"],
-                                "score": team["score"],
-                                **player_boxscore
-                            }]
-                        }
-                    # Player already exists in the stats dictionary, so append to it
-                    else:
-                        player_stats[player["id"]]["boxscores"].append({
-                            "bracketId": game["bracketId"],
-                            "contestId": game["contestId"],
-                            "roundName": game["round"]["title"],
-                            "startDate": game["startDate"],
-                            "gameState": game["gameState"],
-                            "isWinner": team["isWinner"],
-                            "score": team["score"],
-                            **player_boxscore
-                        })
+        # Finished seasons come from their snapshot, otherwise serve the materialized
+        # stats, refreshing them first if they are missing or stale
+        snapshot = load_wapit_snapshot(year, logger)
+        if snapshot is not None:
+            meta, player_stats = {"Version": snapshot["version"]}, snapshot["stats"]
+        else:
+            meta, player_stats = read_materialized_stats(year)
+        if snapshot is None and is_wapit_stats_stale(year, meta):
+            logger.info(f"{LOGGER_CONTEXT} - Refreshing materialized stats")
+            materialize_wapit_stats(year, load_mml_contests(year, logger), logger)
+            meta, player_stats = read_materialized_stats(year)
 
         logger.info(f"{LOGGER_CONTEXT} - Collected MML stats for {len(list(player_stats.keys()))} players !!!")
 
@@ -300,56 +948,75 @@ def get_all_wapit_stats(event, logger):
         body = {
             "timeElapsed": elapsed_time,
             "year": year,
+            "version": meta["Version"],
             "stats": player_stats
         }
 
-        return 200, body
+        # Normalized teams/games tables and per-stat column arrays
+        if response_format == "columnar":
+            columnar = load_wapit_columnar(year, meta["Version"], player_stats)
+            return 200, json_body_with({**body, "format": "columnar"}, "stats", columnar), snapshot_headers(year, logger)
+
+        return 200, body, snapshot_headers(year, logger)
     except Exception as e:
         logger.exception("Exception in Get Scoreboard method !!")
         logger.exception(e)
         return 500, {"error": "Server Error"}
 
 
+# Draftable player pool, built once per season (rosters only change before the First Round)
+def load_wapit_player_pool(year, logger):
+    cache_key = f"ncaa:wapit_pool:{year}"
+    pool = cache_get(cache_key)
+    if pool is None:
+        snapshot = load_wapit_snapshot(year, logger)
+        pool = PlayerPool(snapshot["players"]) if snapshot else PlayerPool.from_contests(load_mml_contests(year, logger))
+        logger.info(f"[ncaa.py / load_wapit_player_pool({year})] - Built pool of {len(pool)} players")
+        cache_set(cache_key, pool, ttl=None if is_historical_season(year) else WAPIT_POOL_TTL)
+    return pool
+
+# Player ids already drafted in a league
+def get_drafted_player_ids(league_id, year):
+    return {
+        str(i["PlayerID"]) for i in iter_draft_picks(league_id + year, ["PlayerID"])
+        if i.get("PlayerID") is not None
+    }
+
 # Get NCAA March Madness Tournament Players
-# 1. Get schedule and determine Day 1 & 2 of tournament (3rd Thursday of March = Day 1)
-# 2. Get all games on Day 1 & Day 2, then filter those on Tournament games
-# 3. For each game, extract the players
+# Every First Round roster, optionally filtered and paginated:
+# GET /ncaa/wapit/players?year=2025&school=duke&seed=1&position=G&name=coo&available_for=abc&offset=0&limit=50
+# available_for drops players already drafted in that league
 def get_wapit_players(event, logger):
     LOGGER_CONTEXT = "[ncaa.py / get_wapit_players()]"
     try:
-        year = event.get("queryStringParameters", {}).get("year", str(datetime.now().year))
+        params = event.get("queryStringParameters") or {}
+        year = params.get("year", str(datetime.now().year))
         if year is None:
             return 400, {"error": "Missing year in query string"}
 
+        try:
+            offset = int(params.get("offset", 0))
+            limit = None if params.get("limit") is None else int(params["limit"])
+        except ValueError:
+            return 400, {"error": "offset and limit must be integers"}
+
         start_time = time.time()
 
-        #URL --- https://sdataprod.ncaa.com/?operationName=gamecenter_game_stats_web&variables={"seasonYear":2024}&extensions={"persistedQuery":{"version":1,"sha256Hash":"0677d7ecf3cf630d58ed4f221c74908fb4494c12e0dacb70c45190d55accdc74"}}
-        response = http.request(
-            "GET", 
-            f"{NCAA_MM_LIVE_URL}?operationName=gamecenter_game_stats_web&variables=%7B%22seasonYear%22:{int(year)-1}%7D&extensions=%7B%22persistedQuery%22:%7B%22version%22:1,%22sha256Hash%22:%220677d7ecf3cf630d58ed4f221c74908fb4494c12e0dacb70c45190d55accdc74%22%7D%7D"
+        pool = load_wapit_player_pool(year, logger)
+        available_for = params.get("available_for")
+        drafted = get_drafted_player_ids(available_for, year) if available_for else None
+
+        total, players = pool.filter(
+            school=params.get("school"),
+            seed=params.get("seed"),
+            position=params.get("position"),
+            name=params.get("name"),
+            exclude_ids=drafted,
+            offset=offset,
+            limit=limit,
         )
 
-        logger.info(f"{LOGGER_CONTEXT} - Response Status:")
-        logger.info(response.status)
-
-        # Get all March Madness games
-        game_stats = json.loads(response.data)["data"]["mmlContests"]
-        players = []
-        counter = 0
-        for game in game_stats:
-            if game["round"]["roundNumber"] == 2: # roundNumber = 2 --> First Round
-                for team in game["teams"]:
-                    #logger.info(f"{LOGGER_CONTEXT} - Adding players from {team['nameFull']}")
-
-                    # Add the school to each player in the roster (for future lookups)
-                    enhanced_roster = team["roster"]
-                    for player in enhanced_roster:
-                        player["school"] = team["nameFull"]
-
-                    players.extend(team["roster"])
-                    counter += 1
-            
-        logger.info(f"{LOGGER_CONTEXT} - {len(players)} players added from {counter} teams!!!")
+        logger.info(f"{LOGGER_CONTEXT} - {len(players)} of {total} matching players returned from a pool of {len(pool)}")
 
         end_time = time.time()
         elapsed_time = end_time - start_time
@@ -359,10 +1026,13 @@ def get_wapit_players(event, logger):
         body = {
             "timeElapsed": elapsed_time,
             "year": year,
+            "total": total,
+            "offset": offset,
             "players": players
         }
 
-        return 200, body
+        # Draft availability changes with every pick, only the plain pool is cacheable
+        return 200, body, None if available_for else snapshot_headers(year, logger)
     except Exception as e:
         logger.exception(f"{LOGGER_CONTEXT} - Exception in Get Scoreboard method !!")
         logger.exception(e)
@@ -475,6 +1145,12 @@ def post_wapit_draft(event, logger):
         ]
         '''
 
+        # Picks already in each league the upload touches, read before the writes
+        existing = {
+            league_key: {int(p["PickNumber"]): p for p in iter_draft_picks(league_key, consistent=True)}
+            for league_key in {pick["LeagueID"] for pick in draft_picks}
+        }
+
         # split upload into chunks of 25
         counter = 0
         for i in range(0, len(draft_picks), 25):  # Process in chunks of 25
@@ -484,6 +1160,15 @@ def post_wapit_draft(event, logger):
                     batch.put_item(Item=pick)
                     counter += 1
 
+        # Write through to the rosters and draft state of every league the picks landed in,
+        # so draft/pick and change pollers see them like bulk-written picks. The state comes
+        # from the picks held here, a re-query right after the writes may not see them yet
+        for league_key, league_picks in existing.items():
+            league_picks.update({int(pick["PickNumber"]): pick for pick in draft_picks if pick["LeagueID"] == league_key})
+            write_league_teams(league_key, list(league_picks.values()))
+            reset_draft_state(league_key, list(league_picks.values()))
+            notify_league(league_key, {"type": "draft.changed"}, logger)
+
         end_time = time.time()
         elapsed_time = end_time - start_time
 
@@ -503,29 +1188,43 @@ def post_wapit_draft(event, logger):
         return 500, {"error": "Server Error"}
     
 
-# GET /ncaa/wapit/league/{league_id}/year/{year}/chat
+# GET /ncaa/wapit/league/{league_id}/year/{year}/chat?limit=50&before=<cursor>|after=<cursor>
+# Latest page by default. "before" in the response pages back to older messages (null at the
+# start of the chat), "after" fetches anything newer than this page. Messages are oldest first
 def get_wapit_chat(event, logger):
     try:
         league_id = event.get("pathParameters", {}).get("league_id", None)
         year      = event.get("pathParameters", {}).get("year", str(datetime.now().year))
-        limit     = int(event.get("queryStringParameters", {}).get("limit", 50))
+        params    = event.get("queryStringParameters") or {}
 
         if league_id is None:
             return 400, {"error": "Missing league_id"}
+        if params.get("before") and params.get("after"):
+            return 400, {"error": "Use either before or after, not both"}
+        try:
+            limit  = max(1, min(int(params.get("limit", 50)), CHAT_MAX_PAGE_SIZE))
+            cursor = params.get("before") or params.get("after")
+            start  = decode_cursor(cursor)["sk"] if cursor else None
+        except (ValueError, KeyError):
+            return 400, {"error": "Invalid limit or cursor"}
+        if start is not None and not str(start).startswith("MSG#"):
+            return 400, {"error": "Invalid cursor"}
 
         # Chat messages live in the same table under a different key prefix
-        # LeagueID = "{league_id}{year}#CHAT", sorted by Timestamp
-        # get_wapit_chat
-        response = table.query(
-            KeyConditionExpression=(
-                Key("LeagueID").eq(f"{league_id}{year}#CHAT") &
-                Key("PickNumber").begins_with("MSG#")
-            ),
-            ScanIndexForward=False,
-            Limit=limit
-        )
-        messages = list(reversed(response.get("Items", [])))
-        return 200, {"messages": messages}
+        # LeagueID = "{league_id}{year}#CHAT", sorted by Timestamp; older days may be archived
+        newer      = bool(params.get("after"))
+        page, more = read_chat_page(chat_key(f"{league_id}{year}"), start, newer, limit)
+        messages   = page if newer else list(reversed(page))
+
+        # Older page exists when paging back stopped early (or there's history behind an "after" page)
+        oldest = messages[0]["PickNumber"] if messages else start
+        newest = messages[-1]["PickNumber"] if messages else start
+        return 200, {
+            "messages": messages,
+            "before":   encode_cursor({"sk": oldest}) if oldest and (more or newer) else None,
+            "after":    encode_cursor({"sk": newest}) if newest else None,
+            "hasMore":  more,
+        }
     except Exception as e:
         logger.exception("Exception in get_wapit_chat")
         return 500, {"error": "Server Error"}
@@ -548,23 +1247,26 @@ def post_wapit_chat(event, logger):
         timestamp = datetime.now().isoformat()
         # post_wapit_chat
         item = {
-            "LeagueID":  f"{league_id}{year}#CHAT",
+            "LeagueID":  chat_key(f"{league_id}{year}"),
             "PickNumber": f"MSG#{timestamp}",   # sort key — lexicographically sortable by time
             "Timestamp":  timestamp,
             "username":   username,
             "text":       text.strip(),
-            "reactions":  {},
+            "reactors":   {},
         }
         table.put_item(Item=item)
 
-        return 201, {"message": item}
+        message = chat_message(item)
+        notify_league(f"{league_id}{year}", {"type": "chat.message", "message": message}, logger)
+        return 201, {"message": message}
     except Exception as e:
         logger.exception("Exception in post_wapit_chat")
         return 500, {"error": "Server Error"}
 
 
 # POST /ncaa/wapit/league/{league_id}/year/{year}/chat/react
-# post_wapit_react — key uses PickNumber, not Timestamp
+# {"pick_number": "MSG#...", "username", "emoji", "action": "toggle" | "add" | "remove"}
+# One conditional update per change, see api/wapit_chat_store.py
 def post_wapit_react(event, logger):
     try:
         league_id    = event.get("pathParameters", {}).get("league_id", None)
@@ -573,30 +1275,21 @@ def post_wapit_react(event, logger):
         pick_number  = body.get("pick_number")   # "MSG#{timestamp}" string
         username     = body.get("username")
         emoji        = body.get("emoji")
+        action       = body.get("action", "toggle")
 
         if not all([league_id, pick_number, username, emoji]):
             return 400, {"error": "Missing required fields"}
 
-        chat_key = f"{league_id}{year}#CHAT"
-        item_key = {"LeagueID": chat_key, "PickNumber": pick_number}
+        if action not in ("toggle", "add", "remove"):
+            return 400, {"error": "action must be toggle, add or remove"}
 
-        resp = table.get_item(Key=item_key)
-        item = resp.get("Item")
-        if not item:
+        item_key  = {"LeagueID": chat_key(f"{league_id}{year}"), "PickNumber": pick_number}
+        reactions = react(item_key, emoji, username, action)
+        if reactions is None:
             return 404, {"error": "Message not found"}
 
-        reactions = item.get("reactions", {})
-        reactors  = set(reactions.get(emoji, []))
-        reactors.discard(username) if username in reactors else reactors.add(username)
-        reactions[emoji] = list(reactors)
-
-        table.update_item(
-            Key=item_key,
-            UpdateExpression="SET reactions = :r",
-            ExpressionAttributeValues={":r": reactions}
-        )
-
-        return 200, {"reactions": reactions}
+        notify_league(f"{league_id}{year}", {"type": "chat.reaction", "pickNumber": pick_number, "reactions": reactions}, logger)
+        return 200, {"reactions": reactions, "counts": count_reactions(reactions)}
     except Exception as e:
         logger.exception("Exception in post_wapit_react")
         return 500, {"error": "Server Error"}
@@ -661,9 +1354,11 @@ def post_wapit_league(event, logger):
             "TotalRounds":    total_rounds,
             "DraftOrder":     draft_order,
             "retroMode":      False,
+            "NextPick":       1,
             "CreatedAt":      datetime.now().isoformat(),
         }
         meta_table.put_item(Item=meta)       # ← meta_table
+        invalidate_league_members(league_id + year)
 
         logger.info(f"{LOGGER_CONTEXT} - Created league {league_id}{year}")
         return 201, {"meta": meta}
@@ -709,11 +1404,16 @@ def patch_wapit_league(event, logger):
 
         meta_table.update_item(                      # ← meta_table
             Key={"LeagueID": league_id + year},      # ← no PickNumber
-            UpdateExpression="SET " + ", ".join(expr_parts),
+            # Meta edits are draft changes too, pickers holding the old version must reload
+            UpdateExpression="SET " + ", ".join(expr_parts) + ", DraftVersion = if_not_exists(DraftVersion, :zero) + :one",
             ExpressionAttributeNames=expr_names,
-            ExpressionAttributeValues=expr_values,
+            ExpressionAttributeValues={**expr_values, ":zero": 0, ":one": 1},
         )
 
+        if "DraftOrder" in updates:
+            invalidate_league_members(league_id + year)
+        notify_league(league_id + year, {"type": "draft.changed"}, logger)
+
         logger.info(f"{LOGGER_CONTEXT} - Updated {league_id}{year}: {list(updates.keys())}")
         return 200, {"updated": list(updates.keys())}
 
@@ -749,20 +1449,25 @@ def delete_wapit_team(event, logger):
             ExpressionAttributeValues={":d": draft_order}
         )
 
-        # Picks still live in wapit_draft — delete via TeamID GSI
-        response = table.query(
-            IndexName="TeamID-index",
-            KeyConditionExpression=Key("TeamID").eq(team_id)
-        )
+        # Picks still live in wapit_draft — delete the team's picks from the league partition
+        picks = list(iter_draft_picks(league_id + year, consistent=True))
+        team_picks = [item for item in picks if item.get("TeamID") == team_id]
+        remaining  = [item for item in picks if item.get("TeamID") != team_id]
         with table.batch_writer() as batch:
-            for item in response.get("Items", []):
-                if item["LeagueID"] == league_id + year:
-                    batch.delete_item(
-                        Key={
-                            "LeagueID":   item["LeagueID"],
-                            "PickNumber": item["PickNumber"],
-                        }
-                    )
+            for item in team_picks:
+                batch.delete_item(
+                    Key={
+                        "LeagueID":   item["LeagueID"],
+                        "PickNumber": item["PickNumber"],
+                    }
+                )
+
+        invalidate_league_members(league_id + year)
+        write_league_teams(league_id + year, remaining)
+        if team_picks:
+            # What is left after the deletes, like draft/bulk passing its final picks
+            reset_draft_state(league_id + year, remaining)
+        notify_league(league_id + year, {"type": "draft.changed"}, logger)
 
         logger.info(f"{LOGGER_CONTEXT} - Removed team {team_id} from {league_id}{year}")
         return 200, {"removed": team_id, "newDraftOrder": draft_order}
@@ -772,7 +1477,10 @@ def delete_wapit_team(event, logger):
         return 500, {"error": "Server Error"}
 
 # Updated get_wapit_league — splits META from picks in the response
+# META, picks and Cognito members are fetched concurrently under LEAGUE_DEADLINE.
+# If only Cognito misses it, the league is returned without users and partial=True
 def get_wapit_league(event, logger):
+    LOGGER_CONTEXT = "[ncaa.py / get_wapit_league]"
     try:
         league_id            = event.get("pathParameters", {}).get("league_id")
         year                 = event.get("pathParameters", {}).get("year", str(datetime.now().year))
@@ -783,29 +1491,33 @@ def get_wapit_league(event, logger):
 
         start_time = time.time()
 
-        # META from its own table — no PickNumber needed
-        meta_resp = meta_table.get_item(         # ← meta_table
-            Key={"LeagueID": league_id + year}   # ← no PickNumber
-        )
-        meta = meta_resp.get("Item")
+        results, failed = run_with_deadline({
+            # META from its own table — no PickNumber needed
+            "meta": lambda: meta_table.get_item(Key={"LeagueID": league_id + year}),
+            "draft": lambda: list(iter_draft_picks(league_id + year)),
+            "teams": lambda: read_league_teams(league_id + year),
+            "users": lambda: get_league_members(cognito, cognito_user_pool_id, league_id + year, logger),
+        }, timeout=LEAGUE_DEADLINE)
 
-        # Picks from wapit_draft — filter out chat messages
-        draft_resp = table.query(
-            KeyConditionExpression=Key("LeagueID").eq(league_id + year)
-        )
-        draft = [
-            i for i in draft_resp.get("Items", [])
-            if not str(i.get("PickNumber", "")).startswith("MSG#")
-        ]
+        # The league itself is required, only the member list may be missing
+        for name in ("meta", "draft", "teams"):
+            if name in failed:
+                raise RuntimeError(f"{name} lookup failed: {failed[name]}")
+        if "users" in failed:
+            logger.warning(f"{LOGGER_CONTEXT} - Cognito users unavailable for {league_id}{year}: {failed['users']}")
+
+        meta = results["meta"].get("Item")
+
+        draft = results["draft"]
 
         if not meta and not draft:
             return 404, {"error": "League not found"}
 
-        users = get_users_in_group(
-            cognito, cognito_user_pool_id,
-            f"wapit_{league_id}{year}", logger
-        )
-        teams   = {} if not draft else populate_teams_in_league(draft, logger)
+        # Rosters are materialized on write, leagues from before that are built once here
+        users   = results.get("users", [])
+        teams   = results["teams"]
+        if teams is None:
+            teams = {} if not draft else write_league_teams(league_id + year, draft)
         elapsed = time.time() - start_time
 
         return 200, {
@@ -817,6 +1529,7 @@ def get_wapit_league(event, logger):
                 "teams":      teams,
                 "draft":      draft,
             },
+            "partial":     "users" in failed,
             "timeElapsed": elapsed
         }
 
@@ -848,37 +1561,50 @@ def post_wapit_draft_bulk(event, logger):
         if meta.get("Status") == "complete":
             return 400, {"error": "Draft is already complete"}
 
-        # Wipe existing picks from wapit_draft (chat stays untouched)
-        existing = table.query(
-            KeyConditionExpression=Key("LeagueID").eq(league_id + year)
-        )
-        existing_picks = [
-            i for i in existing.get("Items", [])
-            if not str(i.get("PickNumber", "")).startswith("MSG#")
-        ]
-        if existing_picks:
-            with table.batch_writer() as batch:
-                for item in existing_picks:
-                    batch.delete_item(
-                        Key={
-                            "LeagueID":   item["LeagueID"],
-                            "PickNumber": item["PickNumber"],
-                        }
-                    )
-
-        # Bulk insert into wapit_draft
+        # Diff against the current picks by PickNumber; Timestamp doesn't count as a change
+        league_key = league_id + year
+        existing = {int(p["PickNumber"]): p for p in iter_draft_picks(league_key)}
         timestamp = datetime.now().isoformat()
-        counter   = 0
-        with table.batch_writer() as batch:
-            for pick in picks:
-                if not all(k in pick for k in ["PickNumber", "TeamID", "PlayerName"]):
-                    continue
-                batch.put_item(Item={
-                    **pick,
-                    "LeagueID":  league_id + year,
-                    "Timestamp": timestamp,
-                })
-                counter += 1
+        desired = {}
+        for pick in picks:
+            if not all(k in pick for k in ["PickNumber", "TeamID", "PlayerName"]):
+                continue
+            item = to_item({**pick, "LeagueID": league_key, "PickNumber": int(pick["PickNumber"])})
+            if item["PickNumber"] in desired:
+                return 400, {"error": f"Duplicate PickNumber {item['PickNumber']}"}
+            desired[item["PickNumber"]] = item
+
+        def without_timestamp(item):
+            return {k: v for k, v in item.items() if k != "Timestamp"}
+
+        inserts = [n for n in desired if n not in existing]
+        updates = [n for n in desired if n in existing and without_timestamp(existing[n]) != without_timestamp(desired[n])]
+        deletes = [n for n in existing if n not in desired]
+        puts    = [{**desired[n], "Timestamp": timestamp} for n in inserts + updates]
+        changes = len(puts) + len(deletes)
+
+        # Small diffs can go in one transaction so readers never see half of it
+        transactional = bool(body.get("transactional"))
+        if transactional and changes > DRAFT_TRANSACTION_MAX_ITEMS:
+            return 400, {"error": f"Transactional mode supports at most {DRAFT_TRANSACTION_MAX_ITEMS} changed picks, got {changes}"}
+
+        if transactional and changes:
+            table.meta.client.transact_write_items(TransactItems=[
+                *({"Put": {"TableName": dynamodb_table_name, "Item": item}} for item in puts),
+                *({"Delete": {"TableName": dynamodb_table_name, "Key": {"LeagueID": league_key, "PickNumber": n}}} for n in deletes),
+            ])
+        elif changes:
+            batch_write_concurrently(dynamodb, dynamodb_table_name, [
+                *({"PutRequest": {"Item": item}} for item in puts),
+                *({"DeleteRequest": {"Key": {"LeagueID": league_key, "PickNumber": n}}} for n in deletes),
+            ])
+
+        # The bulk picks are the whole draft now, rosters are rebuilt from them directly
+        written = {item["PickNumber"]: item for item in puts}
+        final   = [written.get(n, existing.get(n)) for n in desired]
+        write_league_teams(league_key, final)
+        if changes:
+            reset_draft_state(league_key, final)
 
         # Activate league if still pending
         if meta.get("Status") == "pending":
@@ -889,9 +1615,328 @@ def post_wapit_draft_bulk(event, logger):
                 ExpressionAttributeValues={":s": "active"},
             )
 
-        logger.info(f"{LOGGER_CONTEXT} - Bulk inserted {counter} picks into {league_id}{year}")
-        return 201, {"inserted": counter}
+        if changes or meta.get("Status") == "pending":
+            notify_league(league_key, {"type": "draft.changed"}, logger)
+
+        logger.info(f"{LOGGER_CONTEXT} - {league_key}: {len(inserts)} inserted, {len(updates)} updated, {len(deletes)} deleted")
+        return 201, {
+            "inserted":  len(inserts),
+            "updated":   len(updates),
+            "deleted":   len(deletes),
+            "unchanged": len(desired) - len(inserts) - len(updates),
+            "mode":      "transaction" if transactional else "batch",
+        }
+
+    except Exception as e:
+        logger.exception(f"{LOGGER_CONTEXT} - Exception")
+        return 500, {"error": "Server Error"}
+
+# Team on the clock for a pick number. Snake drafts reverse the order every other round
+def team_for_pick(draft_order, pick_number, draft_type="snake"):
+    round_index, slot = divmod(pick_number - 1, len(draft_order))
+    if draft_type == "snake" and round_index % 2 == 1:
+        slot = len(draft_order) - 1 - slot
+    return draft_order[slot]
+
+# Draft/pick fills the board in order: NextPick follows the highest pick made
+def next_pick_after(picks):
+    return max((int(p["PickNumber"]) for p in picks), default=0) + 1
+
+# Bump DraftVersion and reset TakenPlayers/NextPick after a path that rewrote picks wholesale
+# DraftResetVersion tells change pollers behind it to reload the whole board
+def reset_draft_state(league_key, picks):
+    taken = {str(p["PlayerID"]) for p in picks if p.get("PlayerID") is not None}
+    meta_table.update_item(
+        Key={"LeagueID": league_key},
+        UpdateExpression=(
+            "SET DraftVersion = if_not_exists(DraftVersion, :zero) + :one, "
+            "DraftResetVersion = if_not_exists(DraftVersion, :zero) + :one, NextPick = :n"
+            + (", TakenPlayers = :t" if taken else " REMOVE TakenPlayers")
+        ),
+        ExpressionAttributeValues={":zero": 0, ":one": 1, ":n": next_pick_after(picks), **({":t": taken} if taken else {})},
+    )
+
+# Leagues whose draft started before NextPick/TakenPlayers existed get them from their picks,
+# leaving DraftVersion as is so pickers holding it don't have to reload. Returns the fresh meta
+def seed_draft_state(league_key):
+    picks = list(iter_draft_picks(league_key, ["PickNumber", "PlayerID"]))
+    taken = {str(p["PlayerID"]) for p in picks if p.get("PlayerID") is not None}
+    try:
+        meta_table.update_item(
+            Key={"LeagueID": league_key},
+            UpdateExpression="SET DraftVersion = if_not_exists(DraftVersion, :zero), NextPick = :n" + (", TakenPlayers = :t" if taken else ""),
+            ConditionExpression="attribute_exists(LeagueID) AND attribute_not_exists(NextPick)",
+            ExpressionAttributeValues={":zero": 0, ":n": next_pick_after(picks), **({":t": taken} if taken else {})},
+        )
+    except meta_table.meta.client.exceptions.ConditionalCheckFailedException:
+        pass    # seeded by a concurrent pick
+    return meta_table.get_item(Key={"LeagueID": league_key}, ConsistentRead=True).get("Item")
+
+# POST /ncaa/wapit/league/{league_id}/year/{year}/draft/pick
+# {"PickNumber": 13, "TeamID": "...", "PlayerID": "...", "PlayerName": "...", "Position": "G", "Version": 12}
+# One pick in one transaction: the pick number must be the league's NextPick and free, the player
+# untaken, the team on the clock per DraftOrder and Version equal to the league's DraftVersion
+# (DraftVersion and NextPick are bumped on success)
+def post_wapit_draft_pick(event, logger):
+    LOGGER_CONTEXT = "[ncaa.py / post_wapit_draft_pick]"
+    try:
+        league_id = event.get("pathParameters", {}).get("league_id")
+        year      = event.get("pathParameters", {}).get("year", str(datetime.now().year))
+        body      = json.loads(event.get("body") or "{}")
+
+        if not league_id:
+            return 400, {"error": "Missing league_id"}
+        missing = [k for k in ("PickNumber", "TeamID", "PlayerID", "PlayerName", "Version") if body.get(k) is None]
+        if missing:
+            return 400, {"error": f"Missing {', '.join(missing)}"}
+        try:
+            pick_number = int(body["PickNumber"])
+            expected    = int(body["Version"])
+        except (TypeError, ValueError):
+            return 400, {"error": "PickNumber and Version must be integers"}
+
+        caller = get_jwt_username(event)
+        if not caller:
+            return 401, {"error": "Unauthorized"}
+
+        league_key = league_id + year
+        meta = meta_table.get_item(Key={"LeagueID": league_key}).get("Item")
+        if not meta:
+            return 404, {"error": "League not found"}
+        if caller not in (body["TeamID"], meta.get("CommissionerID")):
+            return 403, {"error": "Forbidden — you can only pick for your own team"}
+        if meta.get("Status") != "active":
+            return 400, {"error": "Draft is not active"}
+        if "NextPick" not in meta:
+            meta = seed_draft_state(league_key)
+
+        draft_order = meta.get("DraftOrder", [])
+        total_picks = len(draft_order) * int(meta.get("TotalRounds", 0))
+        if not draft_order or not 1 <= pick_number <= total_picks:
+            return 400, {"error": f"PickNumber must be between 1 and {total_picks}"}
+        on_clock = team_for_pick(draft_order, pick_number, meta.get("DraftType", "snake"))
+        if on_clock != body["TeamID"]:
+            return 409, {"error": f"Pick {pick_number} belongs to {on_clock}", "version": int(meta.get("DraftVersion", 0))}
+        if pick_number != int(meta["NextPick"]):
+            return 409, {"error": f"Pick {pick_number} is not on the clock, next pick is {int(meta['NextPick'])}", "version": int(meta.get("DraftVersion", 0))}
+
+        pick = {
+            **{k: body[k] for k in ("TeamID", "PlayerName", "Position") if k in body},
+            "LeagueID":   league_key,
+            "PickNumber": pick_number,
+            "PlayerID":   str(body["PlayerID"]),
+            "PickedBy":   caller,
+            "Timestamp":  datetime.now().isoformat(),
+            "Version":    expected + 1,
+        }
+        version_condition = "DraftVersion = :v" if expected else "(attribute_not_exists(DraftVersion) OR DraftVersion = :v)"
+
+        try:
+            table.meta.client.transact_write_items(TransactItems=[
+                {"Put": {
+                    "TableName": dynamodb_table_name,
+                    "Item": pick,
+                    "ConditionExpression": "attribute_not_exists(PickNumber)",
+                }},
+                {"Update": {
+                    "TableName": dynamodb_meta_table_name,
+                    "Key": {"LeagueID": league_key},
+                    "ConditionExpression": (
+                        f"{version_condition} AND #s = :active AND DraftOrder = :order "
+                        "AND NextPick = :pick AND NOT contains(TakenPlayers, :pid)"
+                    ),
+                    "UpdateExpression": "SET DraftVersion = :next, NextPick = :after ADD TakenPlayers :pids",
+                    "ExpressionAttributeNames": {"#s": "Status"},
+                    "ExpressionAttributeValues": {
+                        ":v": expected, ":next": expected + 1, ":active": "active", ":order": draft_order,
+                        ":pick": pick_number, ":after": pick_number + 1,
+                        ":pid": pick["PlayerID"], ":pids": {pick["PlayerID"]},
+                    },
+                }},
+            ])
+        except table.meta.client.exceptions.TransactionCanceledException as e:
+            reasons = [r.get("Code") for r in e.response.get("CancellationReasons", [])]
+            current = meta_table.get_item(Key={"LeagueID": league_key}, ConsistentRead=True).get("Item") or {}
+            if reasons and reasons[0] == "ConditionalCheckFailed":
+                error = f"Pick {pick_number} is already taken"
+            elif pick["PlayerID"] in current.get("TakenPlayers", set()):
+                error = f"Player {pick['PlayerID']} is already drafted"
+            elif int(current.get("NextPick", pick_number)) != pick_number:
+                error = f"Pick {pick_number} is not on the clock, next pick is {int(current['NextPick'])}"
+            else:
+                error = "Draft changed since Version, reload and retry"
+            logger.info(f"{LOGGER_CONTEXT} - {league_key} pick {pick_number} rejected: {reasons}")
+            return 409, {"error": error, "version": int(current.get("DraftVersion", 0))}
+
+        # Rosters follow the pick, rebuilt when the league or this team has none yet
+        if not append_league_pick(league_key, pick):
+            refresh_league_teams(league_key)
+
+        notify_league(league_key, {"type": "draft.pick", "pick": pick, "version": expected + 1}, logger)
+        logger.info(f"{LOGGER_CONTEXT} - {league_key} pick {pick_number}: {pick['PlayerName']} to {pick['TeamID']}")
+        return 201, {"pick": pick, "version": expected + 1}
+
+    except Exception as e:
+        logger.exception(f"{LOGGER_CONTEXT} - Exception")
+        return 500, {"error": "Server Error"}
+
+# GET /ncaa/wapit/league/{league_id}/year/{year}/draft/changes?since=12&wait=20
+# Picks and draft meta changed after the client's DraftVersion. When nothing changed yet
+# the request waits (polling the meta item only) up to wait seconds or the Lambda deadline.
+# reset=true means picks were rewritten wholesale and "picks" is the full draft
+def get_wapit_draft_changes(event, logger):
+    LOGGER_CONTEXT = "[ncaa.py / get_wapit_draft_changes]"
+    try:
+        league_id = event.get("pathParameters", {}).get("league_id")
+        year      = event.get("pathParameters", {}).get("year", str(datetime.now().year))
+        params    = event.get("queryStringParameters") or {}
+
+        if not league_id:
+            return 400, {"error": "Missing league_id"}
+        try:
+            since = int(params.get("since", 0))
+            wait  = min(float(params.get("wait", DRAFT_CHANGES_MAX_WAIT)), DRAFT_CHANGES_MAX_WAIT)
+        except ValueError:
+            return 400, {"error": "since and wait must be numbers"}
+
+        league_key = league_id + year
+        deadline   = min(time.time() + wait, event.get("lambdaDeadline", float("inf")) - DRAFT_CHANGES_DEADLINE_MARGIN)
+        interval   = DRAFT_CHANGES_POLL_INTERVAL
+        start_time = time.time()
+
+        # Both reads are consistent, otherwise the response could carry DraftVersion N without
+        # a pick written at N and the client would never ask for that pick again
+        while True:
+            meta = meta_table.get_item(Key={"LeagueID": league_key}, ConsistentRead=True).get("Item")
+            if not meta:
+                return 404, {"error": "League not found"}
+            version = int(meta.get("DraftVersion", 0))
+            remaining = deadline - time.time()
+            if version > since or remaining <= 0:
+                break
+            time.sleep(min(interval, remaining))
+            interval = min(interval * 2, DRAFT_CHANGES_MAX_INTERVAL)
+
+        reset = since < int(meta.get("DraftResetVersion", 0))
+        picks = []
+        if version > since:
+            picks = list(iter_draft_picks(league_key, since_version=None if reset else since, consistent=True))
+
+        elapsed = time.time() - start_time
+        logger.info(f"{LOGGER_CONTEXT} - {league_key} since {since}: version {version}, {len(picks)} picks after {elapsed:.2f} seconds")
+
+        return 200, {
+            "version": version,
+            "changed": version > since,
+            "reset":   reset,
+            "meta":    {k: meta[k] for k in DRAFT_META_FIELDS if k in meta} if version > since else None,
+            "picks":   picks,
+            "timeElapsed": elapsed
+        }
 
     except Exception as e:
         logger.exception(f"{LOGGER_CONTEXT} - Exception")
-        return 500, {"error": "Server Error"}
\ No newline at end of file
+        return 500, {"error": "Server Error"}
+
+# GET /ncaa/wapit/league/{league_id}/year/{year}/leaderboard
+# Joins the league's draft picks to the materialized player stats and applies
+# the league's scoring rules. Cached per league, stats version, rules and picks
+def get_wapit_leaderboard(event, logger):
+    LOGGER_CONTEXT = "[ncaa.py / get_wapit_leaderboard]"
+    try:
+        league_id = event.get("pathParameters", {}).get("league_id")
+        year      = event.get("pathParameters", {}).get("year", str(datetime.now().year))
+
+        if not league_id or not year:
+            return 400, {"error": "Missing league_id or year"}
+
+        start_time = time.time()
+
+        meta = meta_table.get_item(Key={"LeagueID": league_id + year}).get("Item")
+        draft = list(iter_draft_picks(league_id + year, ["LeagueID", "PickNumber", "TeamID", "PlayerID", "PlayerName"]))
+        if not meta and not draft:
+            return 404, {"error": "League not found"}
+
+        stats_meta = get_stats_meta(year)
+        if is_wapit_stats_stale(year, stats_meta):
+            logger.info(f"{LOGGER_CONTEXT} - Refreshing materialized stats for {year}")
+            materialize_wapit_stats(year, load_mml_contests(year, logger), logger)
+            stats_meta = get_stats_meta(year)
+        stats_version = int(stats_meta["Version"])
+
+        rules = scoring_rules_from_meta(meta)
+        picks_hash = zlib.crc32(json.dumps(
+            sorted((str(p["PickNumber"]), str(p.get("TeamID")), str(p.get("PlayerID"))) for p in draft)
+        ).encode("utf-8"))
+        cache_key = f"ncaa:leaderboard:{league_id}{year}:{stats_version}:{rules_hash(rules)}:{picks_hash}"
+
+        leaderboard = cache_get(cache_key)
+        if leaderboard is None:
+            _, stats = read_materialized_stats(year)
+            teams = {} if not draft else populate_teams_in_league(draft, logger)
+            leaderboard = cache_set(cache_key, score_league(teams, stats, rules), ttl=LEADERBOARD_TTL)
+
+        elapsed = time.time() - start_time
+        logger.info(f"{LOGGER_CONTEXT} - {league_id}{year} leaderboard at stats version {stats_version} in {elapsed:.4f} seconds")
+
+        return 200, {
+            "data": {
+                "leagueName":   meta.get("LeagueName", league_id) if meta else league_id,
+                "year":         year,
+                "statsVersion": stats_version,
+                "scoringRules": rules,
+                "leaderboard":  leaderboard,
+            },
+            "timeElapsed": elapsed
+        }
+
+    except Exception as e:
+        logger.exception(f"{LOGGER_CONTEXT} - Exception")
+        return 500, {"error": "Server Error"}
+
+
+# GET /ncaa/wapit/bracket?year=2025
+# Bracket tree built from the stored game states, cached per game-state version
+# so it is rebuilt only after the poller records a change
+def get_wapit_bracket(event, logger):
+    LOGGER_CONTEXT = "[ncaa.py / get_wapit_bracket]"
+    try:
+        params = event.get("queryStringParameters") or {}
+        year = params.get("year", str(datetime.now().year))
+        if not year.isdigit():
+            return 400, {"error": "year must be a 4 digit number"}
+
+        start_time = time.time()
+
+        snapshot = load_wapit_snapshot(year, logger)
+        if snapshot is not None:
+            version = f"snapshot-{snapshot['version']}"
+        else:
+            meta = get_games_meta(year)
+            polled_at = datetime.fromisoformat(meta["PolledAt"]) if meta else None
+            if polled_at is None or (datetime.now() - polled_at).total_seconds() > WAPIT_STATS_REFRESH_AFTER:
+                # Same poll-then-materialize as the scheduled task, so a change stored here
+                # is folded into the stats too rather than hidden from the next poll
+                logger.info(f"{LOGGER_CONTEXT} - Game states for {year} are stale, polling inline")
+                meta = {"Version": refresh_wapit_games(year, logger)["version"]}
+            version = meta["Version"]
+
+        cache_key = f"ncaa:bracket:{year}:{version}"
+        bracket = cache_get(cache_key)
+        if bracket is None:
+            contests = snapshot["contests"] if snapshot is not None else read_changed_games(year)
+            bracket = cache_set(cache_key, build_bracket(contests), ttl=LEADERBOARD_TTL)
+
+        elapsed = time.time() - start_time
+        logger.info(f"{LOGGER_CONTEXT} - {year} bracket at version {version} in {elapsed:.4f} seconds")
+
+        return 200, {
+            "year": year,
+            "version": version,
+            "bracket": bracket,
+            "timeElapsed": elapsed
+        }, snapshot_headers(year, logger)
+
+    except Exception as e:
+        logger.exception(f"{LOGGER_CONTEXT} - Exception")
+        return 500, {"error": "Server Error"}
@@ -0,0 +1,318 @@
+import json
+import time
+import zlib
+import boto3
+from boto3.dynamodb.conditions import Key, Attr
+from boto3.dynamodb.types import Binary, TypeDeserializer
+
+from utils.helper import map_concurrently
+
+'''
+WAPIT chat messages live in wapit_draft next to the picks:
+
+    LeagueID = "{league}{year}#CHAT", PickNumber = "MSG#{timestamp}"
+        Timestamp, username, text, reactors {emoji: {username, ...}}
+
+Each emoji is its own string set inside reactors, so a reaction is a single
+conditional ADD or DELETE on that set and concurrent reactions can't lose
+each other. Messages written before that keep reactions as a map of lists
+({emoji: [username, ...]}); they are converted the first time someone reacts
+to them, or in bulk by the migrate_chat_reactions task.
+
+Old messages are compacted into archive blocks in the same partition:
+
+    PickNumber = "ARC#{day}#{part}"    Data (zlib JSON list of chat_message dicts,
+                                       oldest first), Count, FirstKey, LastKey
+
+compact_chat_partition writes a day's blocks, then sets ExpiresAt on its
+messages so TTL removes them, rewriting the day if a reaction landed in
+between. Messages with ExpiresAt are archived: reads
+skip them and reactions treat them as gone. Compaction only takes whole days
+before a cutoff, so the archive always holds the oldest part of the chat.
+read_chat_page reads live items first and continues into the blocks once it
+passes the newest archived message, so MSG# cursors work across both.
+'''
+
+REACT_MAX_ATTEMPTS = 4
+CHAT_FIELDS = ("PickNumber", "Timestamp", "username", "text", "reactions", "reactors")
+ARCHIVE_PREFIX = "ARC#"
+ARCHIVE_BLOCK_MESSAGES = 500
+ARCHIVE_BLOCKS_PER_QUERY = 4
+
+dynamodb = boto3.resource("dynamodb")
+chat_table_name = "wapit_draft"
+chat_table = dynamodb.Table(chat_table_name)
+_deserializer = TypeDeserializer()
+
+
+def chat_key(league_key):
+    return f"{league_key}#CHAT"
+
+
+# {emoji: [username, ...]} for the UI, from either storage shape
+def render_reactions(item):
+    reactions = {emoji: sorted(users) for emoji, users in (item.get("reactions") or {}).items() if users}
+    for emoji, users in (item.get("reactors") or {}).items():
+        reactions[emoji] = sorted(set(reactions.get(emoji, [])) | set(users))
+    return reactions
+
+
+# A message as the chat UI sees it
+def chat_message(item):
+    message = {field: item[field] for field in ("PickNumber", "Timestamp", "username", "text") if field in item}
+    message["reactions"] = render_reactions(item)
+    return message
+
+
+def count_reactions(reactions):
+    return {emoji: len(users) for emoji, users in reactions.items()}
+
+
+# Converts a map-of-lists item to reactor sets, a no-op if it was already converted
+def migrate_reactions(item_key, legacy):
+    reactors = {emoji: set(users) for emoji, users in (legacy or {}).items() if users}
+    try:
+        chat_table.update_item(
+            Key=item_key,
+            UpdateExpression="SET reactors = :r REMOVE reactions",
+            ConditionExpression="attribute_exists(PickNumber) AND attribute_not_exists(reactors)",
+            ExpressionAttributeValues={":r": reactors},
+        )
+        return True
+    except chat_table.meta.client.exceptions.ConditionalCheckFailedException:
+        return False
+
+
+def _update_reactors(item_key, action, emoji, username, condition):
+    return chat_table.update_item(
+        Key=item_key,
+        UpdateExpression=f"{action} reactors.#e :u",
+        ConditionExpression=condition,
+        ExpressionAttributeNames={"#e": emoji},
+        ExpressionAttributeValues={":u": {username}, **({":n": username} if ":n" in condition else {})},
+        ReturnValues="ALL_NEW",
+        ReturnValuesOnConditionCheckFailure="ALL_OLD",
+    )["Attributes"]
+
+
+# Converted and not archived
+LIVE = "attribute_exists(reactors) AND attribute_not_exists(ExpiresAt)"
+
+
+# action: "add", "remove" or "toggle". Returns the message's reactions after
+# the change, or None when the message doesn't exist or was archived
+def react(item_key, emoji, username, action="toggle"):
+    for _ in range(REACT_MAX_ATTEMPTS):
+        if action == "toggle":
+            # Add unless already there; a failed check says which way to go
+            attempts = [("ADD", f"{LIVE} AND NOT contains(reactors.#e, :n)"),
+                        ("DELETE", f"{LIVE} AND contains(reactors.#e, :n)")]
+        else:
+            attempts = [("ADD" if action == "add" else "DELETE", LIVE)]
+
+        for update, condition in attempts:
+            try:
+                return render_reactions(_update_reactors(item_key, update, emoji, username, condition))
+            except chat_table.meta.client.exceptions.ConditionalCheckFailedException as e:
+                old = e.response.get("Item")
+                if old is None or "ExpiresAt" in old:
+                    return None
+                old = {k: _deserializer.deserialize(v) for k, v in old.items()}
+                if "reactors" not in old:
+                    migrate_reactions(item_key, old.get("reactions"))
+                    break
+        # Both toggle checks lost a race or the item was just migrated, try again
+    raise RuntimeError(f"Reaction on {item_key} did not settle after {REACT_MAX_ATTEMPTS} attempts")
+
+
+# Converts every map-shaped message in one chat partition, returns how many changed
+def migrate_chat_partition(league_key):
+    migrated = 0
+    kwargs = {
+        "KeyConditionExpression": Key("LeagueID").eq(chat_key(league_key)) & Key("PickNumber").begins_with("MSG#"),
+        "FilterExpression": Attr("reactors").not_exists(),
+        "ProjectionExpression": "LeagueID, PickNumber, reactions",
+    }
+    while True:
+        response = chat_table.query(**kwargs)
+        for item in response.get("Items", []):
+            key = {"LeagueID": item["LeagueID"], "PickNumber": item["PickNumber"]}
+            migrated += migrate_reactions(key, item.get("reactions"))
+        if "LastEvaluatedKey" not in response:
+            break
+        kwargs["ExclusiveStartKey"] = response["LastEvaluatedKey"]
+    return migrated
+
+
+def _day(sort_key):
+    # "MSG#2024-03-01T12:00:00" -> "2024-03-01"
+    return sort_key[4:14]
+
+
+def _decode_block(block):
+    return json.loads(zlib.decompress(block["Data"].value))
+
+
+# One page of live (not archived) messages from start, in query order.
+# Returns (items, response)
+def _query_live(partition, start, newer, limit):
+    names = {f"#c{i}": field for i, field in enumerate(CHAT_FIELDS)}
+    kwargs = {
+        "KeyConditionExpression": Key("LeagueID").eq(partition) & Key("PickNumber").begins_with("MSG#"),
+        "FilterExpression": Attr("ExpiresAt").not_exists(),
+        "ScanIndexForward": newer,
+        "Limit": limit,
+        "ProjectionExpression": ", ".join(names),
+        "ExpressionAttributeNames": names,
+    }
+    if start is not None:
+        kwargs["ExclusiveStartKey"] = {"LeagueID": partition, "PickNumber": start}
+    response = chat_table.query(**kwargs)
+    return response.get("Items", []), response
+
+
+# Up to limit archived messages past start (None = from the newest end).
+# Returns (messages in query order, more)
+def _read_archive(partition, start, newer, limit):
+    if newer:
+        condition = Key("PickNumber").between(f"{ARCHIVE_PREFIX}{_day(start)}#", f"{ARCHIVE_PREFIX}~")
+    elif start is not None:
+        condition = Key("PickNumber").between(ARCHIVE_PREFIX, f"{ARCHIVE_PREFIX}{_day(start)}#~")
+    else:
+        condition = Key("PickNumber").begins_with(ARCHIVE_PREFIX)
+
+    messages = []
+    kwargs = {
+        "KeyConditionExpression": Key("LeagueID").eq(partition) & condition,
+        "ScanIndexForward": newer,
+        "Limit": ARCHIVE_BLOCKS_PER_QUERY,
+    }
+    while True:
+        response = chat_table.query(**kwargs)
+        blocks = response.get("Items", [])
+        for i, block in enumerate(blocks):
+            block_messages = _decode_block(block)
+            if newer:
+                candidates = [m for m in block_messages if m["PickNumber"] > start]
+            else:
+                candidates = [m for m in reversed(block_messages) if start is None or m["PickNumber"] < start]
+            wanted = limit - len(messages)
+            messages.extend(candidates[:wanted])
+            if len(messages) == limit:
+                more = len(candidates) > wanted or i < len(blocks) - 1 or "LastEvaluatedKey" in response
+                return messages, more
+        if "LastEvaluatedKey" not in response:
+            return messages, False
+        kwargs["ExclusiveStartKey"] = response["LastEvaluatedKey"]
+
+
+# Messages after (newer=True) or before start, start=None for the latest page.
+# Returns (messages in query order - oldest first when newer, newest first otherwise, more)
+def read_chat_page(partition, start, newer, limit):
+    if newer:
+        # Anything archived after start comes first, live messages follow it
+        archived, more = _read_archive(partition, start, True, limit)
+        if len(archived) == limit:
+            return archived, more
+        live_start = archived[-1]["PickNumber"] if archived else start
+        items, response = _query_live(partition, live_start, True, limit - len(archived))
+        return archived + [chat_message(item) for item in items], "LastEvaluatedKey" in response
+
+    items, response = _query_live(partition, start, False, limit)
+    messages = [chat_message(item) for item in items]
+    if len(messages) == limit:
+        return messages, "LastEvaluatedKey" in response
+    # Live messages ran out (or reached archived ones), the rest are in blocks
+    boundary = messages[-1]["PickNumber"] if messages else start
+    archived, more = _read_archive(partition, boundary, False, limit - len(messages))
+    return messages + archived, more
+
+
+def _read_day(partition, day):
+    messages = []
+    kwargs = {"KeyConditionExpression": Key("LeagueID").eq(partition) & Key("PickNumber").begins_with(f"{ARCHIVE_PREFIX}{day}#")}
+    while True:
+        response = chat_table.query(**kwargs)
+        for block in response.get("Items", []):
+            messages.extend(_decode_block(block))
+        if "LastEvaluatedKey" not in response:
+            return messages
+        kwargs["ExclusiveStartKey"] = response["LastEvaluatedKey"]
+
+
+def _write_day(partition, day, messages):
+    for part, i in enumerate(range(0, len(messages), ARCHIVE_BLOCK_MESSAGES)):
+        block = messages[i:i + ARCHIVE_BLOCK_MESSAGES]
+        chat_table.put_item(Item={
+            "LeagueID": partition,
+            "PickNumber": f"{ARCHIVE_PREFIX}{day}#{part:02d}",
+            "Data": Binary(zlib.compress(json.dumps(block).encode("utf-8"), 9)),
+            "Count": len(block),
+            "FirstKey": block[0]["PickNumber"],
+            "LastKey": block[-1]["PickNumber"],
+        })
+
+
+# Sets ExpiresAt on one live message, returning it as chat_message as of that moment
+# (None if it is gone). Only the attribute is touched, so a reaction landing mid-compaction
+# is kept on the item and shows up in the returned message instead of being overwritten
+def _expire_message(item_key, expires_at):
+    try:
+        item = chat_table.update_item(
+            Key=item_key,
+            UpdateExpression="SET ExpiresAt = :e",
+            ConditionExpression="attribute_exists(PickNumber) AND attribute_not_exists(ExpiresAt)",
+            ExpressionAttributeValues={":e": expires_at},
+            ReturnValues="ALL_NEW",
+            ReturnValuesOnConditionCheckFailure="ALL_OLD",
+        )["Attributes"]
+    except chat_table.meta.client.exceptions.ConditionalCheckFailedException as e:
+        # Already archived by an overlapping run, which archived its current state
+        old = e.response.get("Item")
+        if old is None:
+            return None
+        item = {k: _deserializer.deserialize(v) for k, v in old.items()}
+    return chat_message(item)
+
+
+# Archives live messages from days before cutoff_day ("YYYY-MM-DD"). Safe to re-run:
+# a day's blocks are rewritten with the union of what they held and its live messages
+def compact_chat_partition(league_key, cutoff_day):
+    partition = chat_key(league_key)
+    items = []
+    kwargs = {
+        "KeyConditionExpression": Key("LeagueID").eq(partition) & Key("PickNumber").between("MSG#", f"MSG#{cutoff_day}"),
+        "FilterExpression": Attr("ExpiresAt").not_exists(),
+    }
+    while True:
+        response = chat_table.query(**kwargs)
+        items.extend(response.get("Items", []))
+        if "LastEvaluatedKey" not in response:
+            break
+        kwargs["ExclusiveStartKey"] = response["LastEvaluatedKey"]
+
+    by_day = {}
+    for item in items:
+        by_day.setdefault(_day(item["PickNumber"]), []).append(item)
+
+    expires_at = int(time.time())
+    rewritten = 0
+    for day, day_items in sorted(by_day.items()):
+        merged = {message["PickNumber"]: message for message in _read_day(partition, day)}
+        merged.update({item["PickNumber"]: chat_message(item) for item in day_items})
+        _write_day(partition, day, [merged[key] for key in sorted(merged)])
+
+        # Blocks are written, hand the individual items to TTL. Once ExpiresAt is set
+        # react() leaves the item alone, so what comes back is its final state
+        final = map_concurrently(
+            lambda item: _expire_message({"LeagueID": partition, "PickNumber": item["PickNumber"]}, expires_at),
+            day_items,
+        )
+        changed = [message for message in final if message is not None and message != merged[message["PickNumber"]]]
+        for message in changed:
+            merged[message["PickNumber"]] = message
+        if changed:
+            _write_day(partition, day, [merged[key] for key in sorted(merged)])
+            rewritten += 1
+
+    return {"messages": len(items), "days": len(by_day), "daysRewritten": rewritten}
@@ -0,0 +1,121 @@
+import json
+import time
+import zlib
+from boto3.dynamodb.conditions import Key, Attr
+from boto3.dynamodb.types import Binary
+from datetime import datetime
+
+from api.wapit_stats_store import stats_table, to_item, from_item
+
+'''
+Compact per-game tournament state, kept next to the materialized stats in
+wapit_stats:
+
+    Year = "2025", ItemKey = "GAMES"          Version, ChangedGames (last poll), PolledAt
+    Year = "2025", ItemKey = "GAME#{id}"      GameState, Scores, BoxscoreHash, Version, Game (zlib JSON)
+
+Each poll fingerprints every game (state, team scores, box score hash) and
+writes only the games whose fingerprint moved. A game's Version is the
+GAMES version of the poll that last changed it, so consumers can ask for
+"games changed after version N" instead of re-reading the tournament.
+'''
+
+GAME_PREFIX = "GAME#"
+
+
+# Box score hash is over the canonical JSON, so key order upstream doesn't matter
+def game_fingerprint(game):
+    return {
+        "GameState": game.get("gameState"),
+        "Scores": {str(t.get("seoname")): t.get("score") for t in game.get("teams", [])},
+        "BoxscoreHash": zlib.crc32(json.dumps(game.get("boxscore"), sort_keys=True).encode("utf-8")),
+    }
+
+
+# {contestId: fingerprint} of the stored games, without their payloads
+def _stored_fingerprints(year, table):
+    fingerprints = {}
+    kwargs = {
+        "KeyConditionExpression": Key("Year").eq(year) & Key("ItemKey").begins_with(GAME_PREFIX),
+        "ProjectionExpression": "ItemKey, GameState, Scores, BoxscoreHash",
+    }
+    while True:
+        response = table.query(**kwargs)
+        for item in response["Items"]:
+            fingerprints[item["ItemKey"][len(GAME_PREFIX):]] = from_item(
+                {k: v for k, v in item.items() if k != "ItemKey"}
+            )
+        if "LastEvaluatedKey" not in response:
+            break
+        kwargs["ExclusiveStartKey"] = response["LastEvaluatedKey"]
+    return fingerprints
+
+
+def get_games_meta(year, table=stats_table):
+    item = table.get_item(Key={"Year": year, "ItemKey": "GAMES"}, ConsistentRead=True).get("Item")
+    return None if item is None else from_item(item)
+
+
+# Diff the contests against the stored fingerprints and write the changed games
+# Returns a summary with the changed contestIds and the new version
+def poll_wapit_games(year, contests, logger, table=stats_table):
+    LOGGER_CONTEXT = f"[wapit_games_store.py / poll_wapit_games({year})]"
+    start_time = time.time()
+
+    stored = _stored_fingerprints(year, table)
+    changed = []
+    for game in contests:
+        fingerprint = game_fingerprint(game)
+        if stored.get(str(game["contestId"])) != from_item(to_item(fingerprint)):
+            changed.append((game, fingerprint))
+
+    now = datetime.now().isoformat()
+    if not changed:
+        meta = table.update_item(
+            Key={"Year": year, "ItemKey": "GAMES"},
+            UpdateExpression="SET PolledAt = :p, ChangedGames = :empty, Version = if_not_exists(Version, :zero)",
+            ExpressionAttributeValues={":p": now, ":empty": [], ":zero": 0},
+            ReturnValues="ALL_NEW",
+        )["Attributes"]
+        logger.info(f"{LOGGER_CONTEXT} - No game changes across {len(contests)} games")
+        return {"year": year, "changedGames": [], "version": int(meta["Version"])}
+
+    changed_ids = [str(game["contestId"]) for game, _ in changed]
+    meta = table.update_item(
+        Key={"Year": year, "ItemKey": "GAMES"},
+        UpdateExpression="SET PolledAt = :p, ChangedGames = :c, Version = if_not_exists(Version, :zero) + :one",
+        ExpressionAttributeValues={":p": now, ":c": changed_ids, ":zero": 0, ":one": 1},
+        ReturnValues="ALL_NEW",
+    )["Attributes"]
+    version = int(meta["Version"])
+
+    with table.batch_writer() as batch:
+        for game, fingerprint in changed:
+            batch.put_item(Item={
+                **to_item(fingerprint),
+                "Year": year,
+                "ItemKey": f"{GAME_PREFIX}{game['contestId']}",
+                "Version": version,
+                "UpdatedAt": now,
+                "Game": Binary(zlib.compress(json.dumps(game).encode("utf-8"))),
+            })
+
+    elapsed_time = time.time() - start_time
+    logger.info(f"{LOGGER_CONTEXT} - {len(changed_ids)} of {len(contests)} games changed (version {version}) in {elapsed_time:.4f} seconds")
+
+    return {"year": year, "changedGames": changed_ids, "version": version}
+
+
+# Stored games changed after since_version (all games when None), as mmlContests entries
+def read_changed_games(year, since_version=None, table=stats_table):
+    games = []
+    kwargs = {"KeyConditionExpression": Key("Year").eq(year) & Key("ItemKey").begins_with(GAME_PREFIX)}
+    if since_version is not None:
+        kwargs["FilterExpression"] = Attr("Version").gt(int(since_version))
+    while True:
+        response = table.query(**kwargs)
+        games.extend(json.loads(zlib.decompress(item["Game"].value)) for item in response["Items"])
+        if "LastEvaluatedKey" not in response:
+            break
+        kwargs["ExclusiveStartKey"] = response["LastEvaluatedKey"]
+    return games
@@ -0,0 +1,151 @@
+import os
+import json
+import time
+import boto3
+from botocore.exceptions import ClientError
+from boto3.dynamodb.conditions import Key
+
+from utils.helper import DateTimeEncoder, map_concurrently
+
+'''
+WebSocket push for WAPIT chat and drafts. Clients open the WebSocket API with
+?league_id=...&year=... and get small deltas as JSON messages:
+
+    {"type": "chat.message",  "message": {...}}
+    {"type": "chat.reaction", "pickNumber": "MSG#...", "reactions": {...}}
+    {"type": "draft.pick",    "pick": {...}, "version": 13}
+    {"type": "draft.changed"}        reload with GET .../draft/changes?since=
+
+Open connections are kept in wapit_connections:
+
+    LeagueKey = "{league}{year}", ConnectionID    ExpiresAt (TTL)
+    ConnectionID-index                            for $disconnect
+
+Posting goes through the API Gateway management API at WEBSOCKET_ENDPOINT.
+Without it (local runs) broadcasts are skipped; set_management_api swaps in
+any object with post_to_connection, e.g. a botocore Stubber'd client, and
+broadcast(..., table=...) takes any object with the Table query/delete_item
+calls, so fan-out runs locally without AWS (examples/wapit_broadcast_stub.py).
+'''
+
+# API Gateway drops WebSocket connections after 2 hours
+CONNECTION_TTL = 2 * 60 * 60
+
+dynamodb = boto3.resource("dynamodb")
+connections_table = dynamodb.Table("wapit_connections")
+meta_table = dynamodb.Table("wapit_meta")
+
+_management_api = None
+
+
+def get_management_api():
+    global _management_api
+    if _management_api is None and os.environ.get("WEBSOCKET_ENDPOINT"):
+        _management_api = boto3.client("apigatewaymanagementapi", endpoint_url=os.environ["WEBSOCKET_ENDPOINT"])
+    return _management_api
+
+
+def set_management_api(api):
+    global _management_api
+    _management_api = api
+
+
+# WebSocket events carry a connectionId and an eventType (CONNECT, DISCONNECT, MESSAGE)
+def is_websocket_event(event):
+    context = event.get("requestContext", {})
+    return "connectionId" in context and "eventType" in context
+
+
+def handle_websocket(event, logger):
+    event_type = event["requestContext"]["eventType"]
+    if event_type == "CONNECT":
+        return connect(event, logger)
+    if event_type == "DISCONNECT":
+        return disconnect(event, logger)
+    return on_message(event, logger)
+
+
+# $connect ?league_id=...&year=... - rejected unless the league exists
+def connect(event, logger):
+    LOGGER_CONTEXT = "[wapit_realtime.py / connect]"
+    params = event.get("queryStringParameters") or {}
+    league_id, year = params.get("league_id"), params.get("year")
+    if not league_id or not year:
+        return 400, {"error": "Missing league_id or year"}
+    if "Item" not in meta_table.get_item(Key={"LeagueID": league_id + year}, ProjectionExpression="LeagueID"):
+        return 404, {"error": "League not found"}
+
+    connection_id = event["requestContext"]["connectionId"]
+    connections_table.put_item(Item={
+        "LeagueKey": league_id + year,
+        "ConnectionID": connection_id,
+        "ExpiresAt": int(time.time()) + CONNECTION_TTL,
+    })
+    logger.info(f"{LOGGER_CONTEXT} - {connection_id} joined {league_id}{year}")
+    return 200, {}
+
+
+def _forget(connection_id):
+    response = connections_table.query(
+        IndexName="ConnectionID-index",
+        KeyConditionExpression=Key("ConnectionID").eq(connection_id),
+    )
+    for item in response.get("Items", []):
+        connections_table.delete_item(Key={"LeagueKey": item["LeagueKey"], "ConnectionID": connection_id})
+
+
+def disconnect(event, logger):
+    _forget(event["requestContext"]["connectionId"])
+    return 200, {}
+
+
+# Clients only send {"action": "ping"} to keep an idle connection open
+def on_message(event, logger):
+    try:
+        body = json.loads(event.get("body") or "{}")
+    except ValueError:
+        return 400, {"error": "Invalid JSON"}
+    if body.get("action") != "ping":
+        return 400, {"error": "Unknown action"}
+    return 200, {"action": "pong"}
+
+
+# Sends one delta to every connection in the league, returns how many got it.
+# Connections API Gateway reports gone are removed
+def broadcast(league_key, message, api=None, table=connections_table):
+    api = api or get_management_api()
+    if api is None:
+        return 0
+
+    connection_ids = []
+    kwargs = {"KeyConditionExpression": Key("LeagueKey").eq(league_key), "ProjectionExpression": "ConnectionID"}
+    while True:
+        response = table.query(**kwargs)
+        connection_ids.extend(item["ConnectionID"] for item in response.get("Items", []))
+        if "LastEvaluatedKey" not in response:
+            break
+        kwargs["ExclusiveStartKey"] = response["LastEvaluatedKey"]
+
+    data = json.dumps(message, cls=DateTimeEncoder).encode("utf-8")
+
+    def send(connection_id):
+        try:
+            api.post_to_connection(ConnectionId=connection_id, Data=data)
+            return True
+        except ClientError as e:
+            if e.response.get("Error", {}).get("Code") != "GoneException":
+                raise
+            table.delete_item(Key={"LeagueKey": league_key, "ConnectionID": connection_id})
+            return False
+
+    return sum(map_concurrently(send, connection_ids))
+
+
+# Fan-out never fails the write that triggered it
+def notify_league(league_key, message, logger):
+    LOGGER_CONTEXT = "[wapit_realtime.py / notify_league]"
+    try:
+        return broadcast(league_key, message)
+    except Exception:
+        logger.exception(f"{LOGGER_CONTEXT} - {message.get('type')} for {league_key} not delivered")
+        return 0
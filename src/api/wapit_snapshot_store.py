@@ -0,0 +1,82 @@
+import json
+import zlib
+from boto3.dynamodb.conditions import Key
+from boto3.dynamodb.types import Binary
+from datetime import datetime
+
+from api.wapit_stats_store import stats_table, from_item
+
+'''
+Frozen WAPIT data for a finished tournament, stored once in wapit_stats:
+
+    Year = "2024", ItemKey = "SNAPSHOT"          Chunks, Bytes, CreatedAt, Version
+    Year = "2024", ItemKey = "SNAPSHOT#0000"...  Data (one slice of the zlib JSON artifact)
+
+The artifact holds the processed contests, the draftable player pool and the
+aggregated player stats. It is split into chunks to stay under the DynamoDB
+item size limit, and the whole snapshot is read back with a single query.
+The header item is written last with attribute_not_exists, so a snapshot is
+either complete or absent and is never overwritten.
+'''
+
+SNAPSHOT_KEY = "SNAPSHOT"
+CHUNK_BYTES = 350 * 1024
+
+
+class SnapshotExistsError(Exception):
+    pass
+
+
+def _chunk_key(i):
+    return f"{SNAPSHOT_KEY}#{i:04d}"
+
+
+# artifact: {"contests": [...], "players": [...], "stats": {...}}
+# Returns the header written
+def write_snapshot(year, artifact, version, table=stats_table):
+    if table.get_item(Key={"Year": year, "ItemKey": SNAPSHOT_KEY}).get("Item"):
+        raise SnapshotExistsError(f"Snapshot for {year} already exists")
+
+    data = zlib.compress(json.dumps(artifact).encode("utf-8"), 9)
+    chunks = [data[i:i + CHUNK_BYTES] for i in range(0, len(data), CHUNK_BYTES)]
+
+    with table.batch_writer() as batch:
+        for i, chunk in enumerate(chunks):
+            batch.put_item(Item={"Year": year, "ItemKey": _chunk_key(i), "Data": Binary(chunk)})
+
+    header = {
+        "Year": year,
+        "ItemKey": SNAPSHOT_KEY,
+        "Chunks": len(chunks),
+        "Bytes": len(data),
+        "CreatedAt": datetime.now().isoformat(),
+        "Version": version,
+    }
+    try:
+        table.put_item(Item=header, ConditionExpression="attribute_not_exists(ItemKey)")
+    except table.meta.client.exceptions.ConditionalCheckFailedException:
+        raise SnapshotExistsError(f"Snapshot for {year} already exists")
+    return header
+
+
+# Returns (header, artifact) or (None, None) when the year has no complete snapshot
+def read_snapshot(year, table=stats_table):
+    header = None
+    chunks = {}
+    kwargs = {"KeyConditionExpression": Key("Year").eq(year) & Key("ItemKey").begins_with(SNAPSHOT_KEY)}
+    while True:
+        response = table.query(**kwargs)
+        for item in response["Items"]:
+            if item["ItemKey"] == SNAPSHOT_KEY:
+                header = from_item(item)
+            else:
+                chunks[item["ItemKey"]] = item["Data"].value
+        if "LastEvaluatedKey" not in response:
+            break
+        kwargs["ExclusiveStartKey"] = response["LastEvaluatedKey"]
+
+    if header is None:
+        return None, None
+
+    data = b"".join(chunks[_chunk_key(i)] for i in range(header["Chunks"]))
+    return header, json.loads(zlib.decompress(data))
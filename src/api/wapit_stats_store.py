@@ -0,0 +1,257 @@
+import os
+import json
+import time
+import zlib
+import boto3
+from boto3.dynamodb.conditions import Key
+from boto3.dynamodb.types import Binary
+from datetime import datetime
+from decimal import Decimal
+
+from utils.wapit_stats import aggregate_player_stats, is_counted_game
+
+'''
+Materialized WAPIT player stats, one partition per tournament year in wapit_stats:
+
+    Year = "2025", ItemKey = "META"          ProcessedGames (final contestIds), Version, UpdatedAt, PolledAt,
+                                             GamesVersion (GAMES Version the stats were built from)
+    Year = "2025", ItemKey = "LIVE"          zlib JSON of stats from games still in progress
+    Year = "2025", ItemKey = "PLAYER#{id}"   player + school fields, boxscores[], totals, roundAverages
+
+Final games never change, so each run only aggregates games that turned final
+since the last run and appends them to the affected players. Set
+DYNAMODB_ENDPOINT_URL to run against a local DynamoDB (localstack, dynamodb-local).
+'''
+
+dynamodb_stats_table_name = "wapit_stats"
+dynamodb = boto3.resource("dynamodb", endpoint_url=os.environ.get("DYNAMODB_ENDPOINT_URL"))
+stats_table = dynamodb.Table(dynamodb_stats_table_name)
+
+FINAL_STATE = "F"
+
+# Box score fields that are identifiers/context, not player stats
+NON_STAT_FIELDS = {"bracketId", "contestId", "num", "score", "isWinner"}
+
+
+# DynamoDB rejects floats - round trip through JSON to get Decimals
+def to_item(obj):
+    return json.loads(json.dumps(obj), parse_float=Decimal)
+
+
+# And back - whole Decimals become ints so ids and counts keep their JSON shape
+def from_item(obj):
+    if isinstance(obj, Decimal):
+        return int(obj) if obj == obj.to_integral_value() else float(obj)
+    if isinstance(obj, dict):
+        return {k: from_item(v) for k, v in obj.items()}
+    if isinstance(obj, (list, set)):
+        return [from_item(v) for v in obj]
+    return obj
+
+
+def _number(value):
+    if isinstance(value, bool):
+        return None
+    if isinstance(value, (int, float, Decimal)):
+        return value
+    if isinstance(value, str):
+        try:
+            return float(value) if "." in value else int(value)
+        except ValueError:
+            return None
+    return None
+
+
+# Running totals and per-round averages over a player's box score rows
+def summarize_boxscores(boxscores):
+    totals = {}
+    rounds = {}
+    for row in boxscores:
+        round_totals = rounds.setdefault(row.get("roundName"), {"games": 0, "totals": {}})
+        round_totals["games"] += 1
+        for field, value in row.items():
+            number = _number(value)
+            if field in NON_STAT_FIELDS or number is None:
+                continue
+            totals[field] = totals.get(field, 0) + number
+            round_totals["totals"][field] = round_totals["totals"].get(field, 0) + number
+
+    round_averages = {
+        round_name: {field: round(total / r["games"], 2) for field, total in r["totals"].items()}
+        for round_name, r in rounds.items()
+    }
+    return totals, round_averages
+
+
+def _player_item(year, entry, boxscores):
+    totals, round_averages = summarize_boxscores(boxscores)
+    return to_item({
+        **{k: v for k, v in entry.items() if k != "boxscores"},
+        "Year": year,
+        "ItemKey": f"PLAYER#{entry['id']}",
+        "boxscores": boxscores,
+        "gamesPlayed": len(boxscores),
+        "totals": totals,
+        "roundAverages": round_averages,
+    })
+
+
+# BatchGetItem in chunks of 100, retrying unprocessed keys
+def _batch_get_players(table, year, player_ids):
+    items = {}
+    keys = [{"Year": year, "ItemKey": f"PLAYER#{pid}"} for pid in player_ids]
+    for i in range(0, len(keys), 100):
+        request = {table.name: {"Keys": keys[i:i + 100], "ConsistentRead": True}}
+        attempt = 0
+        while request:
+            response = dynamodb.batch_get_item(RequestItems=request)
+            for item in response["Responses"].get(table.name, []):
+                items[item["ItemKey"][len("PLAYER#"):]] = from_item(item)
+            request = response.get("UnprocessedKeys") or None
+            attempt += 1
+            if request:
+                time.sleep(min(0.05 * 2 ** attempt, 1))
+    return items
+
+
+def get_stats_meta(year, table=stats_table):
+    return table.get_item(Key={"Year": year, "ItemKey": "META"}, ConsistentRead=True).get("Item")
+
+
+# Record that a poll found the stats current, without touching the version
+# Returns False when the year was never materialized
+def mark_stats_polled(year, table=stats_table):
+    try:
+        table.update_item(
+            Key={"Year": year, "ItemKey": "META"},
+            UpdateExpression="SET PolledAt = :p",
+            ConditionExpression="attribute_exists(ItemKey)",
+            ExpressionAttributeValues={":p": datetime.now().isoformat()},
+        )
+        return True
+    except table.meta.client.exceptions.ConditionalCheckFailedException:
+        return False
+
+
+# Fold newly final games (and the current in-progress games) into the store
+# games_version is the GAMES Version the contests were polled at, recorded on META
+# Returns a summary of what was written
+def materialize_wapit_stats(year, contests, logger, table=stats_table, games_version=None):
+    LOGGER_CONTEXT = f"[wapit_stats_store.py / materialize_wapit_stats({year})]"
+    start_time = time.time()
+
+    meta = get_stats_meta(year, table) or {}
+    processed = set(meta.get("ProcessedGames", set()))
+
+    counted = [game for game in contests if is_counted_game(game)]
+    new_final = [g for g in counted if g["gameState"] == FINAL_STATE and str(g["contestId"]) not in processed]
+    in_progress = [g for g in counted if g["gameState"] != FINAL_STATE]
+
+    live_json = json.dumps(aggregate_player_stats(in_progress), sort_keys=True).encode("utf-8")
+    live_hash = zlib.crc32(live_json)
+
+    # Nothing turned final and the live games look the same - keep the current version
+    if not new_final and meta and int(meta.get("LiveHash", -1)) == live_hash:
+        logger.info(f"{LOGGER_CONTEXT} - No changes")
+        table.update_item(
+            Key={"Year": year, "ItemKey": "META"},
+            UpdateExpression="SET UpdatedAt = :u" + (", GamesVersion = :gv" if games_version is not None else ""),
+            ExpressionAttributeValues={":u": datetime.now().isoformat(), **({":gv": games_version} if games_version is not None else {})},
+        )
+        return {
+            "year": year,
+            "newFinalGames": [],
+            "playersUpdated": 0,
+            "inProgressGames": len(in_progress),
+            "version": int(meta.get("Version", 0)),
+        }
+
+    new_stats = aggregate_player_stats(new_final)
+    existing = _batch_get_players(table, year, [str(pid) for pid in new_stats]) if new_stats else {}
+
+    with table.batch_writer() as batch:
+        for player_id, entry in new_stats.items():
+            new_ids = {str(row["contestId"]) for row in entry["boxscores"]}
+            previous = [
+                row for row in existing.get(str(player_id), {}).get("boxscores", [])
+                if str(row["contestId"]) not in new_ids
+            ]
+            boxscores = sorted(previous + entry["boxscores"], key=lambda row: (str(row["startDate"]), int(row["bracketId"])))
+            batch.put_item(Item=_player_item(year, entry, boxscores))
+
+        batch.put_item(Item={"Year": year, "ItemKey": "LIVE", "stats": Binary(zlib.compress(live_json))})
+
+    # META last, so a failed run is simply redone (player writes are idempotent)
+    update = "SET UpdatedAt = :u, LiveHash = :h, Version = if_not_exists(Version, :zero) + :one"
+    values = {":u": datetime.now().isoformat(), ":h": live_hash, ":zero": 0, ":one": 1}
+    if games_version is not None:
+        update += ", GamesVersion = :gv"
+        values[":gv"] = games_version
+    if new_final:
+        update += " ADD ProcessedGames :g"
+        values[":g"] = {str(g["contestId"]) for g in new_final}
+    response = table.update_item(
+        Key={"Year": year, "ItemKey": "META"},
+        UpdateExpression=update,
+        ExpressionAttributeValues=values,
+        ReturnValues="ALL_NEW",
+    )
+
+    elapsed_time = time.time() - start_time
+    logger.info(f"{LOGGER_CONTEXT} - {len(new_final)} new final games, {len(new_stats)} players updated in {elapsed_time:.4f} seconds")
+
+    return {
+        "year": year,
+        "newFinalGames": [str(g["contestId"]) for g in new_final],
+        "playersUpdated": len(new_stats),
+        "inProgressGames": len(in_progress),
+        "version": int(response["Attributes"]["Version"]),
+    }
+
+
+# Read the materialized stats in the get_all_wapit_stats shape
+# META and LIVE come from one BatchGetItem, players from a PLAYER# range query, so the
+# GAME# and SNAPSHOT# items sharing the partition are never read
+# Returns (meta, stats) or (None, None) when the year was never materialized
+def read_materialized_stats(year, table=stats_table):
+    meta = None
+    live = {}
+    stats = {}
+
+    request = {table.name: {"Keys": [{"Year": year, "ItemKey": "META"}, {"Year": year, "ItemKey": "LIVE"}], "ConsistentRead": True}}
+    attempt = 0
+    while request:
+        response = dynamodb.batch_get_item(RequestItems=request)
+        for item in response["Responses"].get(table.name, []):
+            if item["ItemKey"] == "META":
+                meta = item
+            else:
+                live = json.loads(zlib.decompress(item["stats"].value))
+        request = response.get("UnprocessedKeys") or None
+        attempt += 1
+        if request:
+            time.sleep(min(0.05 * 2 ** attempt, 1))
+
+    if meta is None:
+        return None, None
+
+    kwargs = {"KeyConditionExpression": Key("Year").eq(year) & Key("ItemKey").begins_with("PLAYER#")}
+    while True:
+        response = table.query(**kwargs)
+        for item in response["Items"]:
+            player = from_item({k: v for k, v in item.items() if k not in ("Year", "ItemKey")})
+            stats[str(player["id"])] = player
+        if "LastEvaluatedKey" not in response:
+            break
+        kwargs["ExclusiveStartKey"] = response["LastEvaluatedKey"]
+
+    meta = from_item(meta)
+
+    # Games still in progress go after the final ones
+    for player_id, entry in live.items():
+        if player_id in stats:
+            stats[player_id]["boxscores"] = list(stats[player_id]["boxscores"]) + entry["boxscores"]
+        else:
+            stats[player_id] = entry
+
+    return meta, stats
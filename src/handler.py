@@ -2,15 +2,21 @@ from datetime import datetime
 import os
 import json
 import logging
+import time
 import boto3
 import urllib3
 from api.ncaa import (
-    get_schools, get_schedule, get_scoreboard, get_game_details,
+    get_schools, get_school_lookup, post_school_lookup, get_schedule, get_scoreboard, get_game_details,
+    get_schedule_range, get_scoreboard_range,
     get_wapit_players, get_wapit_stats, get_wapit_league, post_wapit_draft,
     get_all_wapit_stats, get_wapit_chat, post_wapit_chat, post_wapit_react,
     post_wapit_league, patch_wapit_league,           # ← new
     delete_wapit_team,        # ← new
-    post_wapit_draft_bulk
+    post_wapit_draft_bulk, run_materialize_wapit_stats, get_wapit_leaderboard,
+    get_wapit_stats_bulk, run_poll_wapit_games, run_snapshot_wapit_season,
+    get_wapit_bracket, run_backfill_league_teams, run_check_league_teams, run_migrate_chat_reactions,
+    run_compact_wapit_chat,
+    post_wapit_draft_pick, get_wapit_draft_changes
 )
 from api.pick_poolr import (
     create_bet_record, get_bet_record, delete_bet_record, update_bet_record,
@@ -24,8 +30,9 @@ from api.espn import (
     get_athlete_gamelog, get_athlete_eventlog, get_athlete_splits,
     get_game_summary, get_game_boxscore, get_game_playbyplay, get_game_plays,
     get_game_drives, get_site_leaders, get_core_leaders, get_draft,
-    get_team_news, get_specific_nights
+    get_team_news, get_specific_nights, get_athlete_search
 )
+from api.wapit_realtime import is_websocket_event, handle_websocket
 from utils.helper import build_response
 
 logging.basicConfig()
@@ -35,6 +42,17 @@ logger.setLevel(logging.INFO)
 
 dynamodb = boto3.resource("dynamodb")
 
+# Non-HTTP invocations (EventBridge schedules, manual runs) carry a "task" name
+TASKS = {
+    "materialize_wapit_stats": run_materialize_wapit_stats,
+    "poll_wapit_games": run_poll_wapit_games,
+    "snapshot_wapit_season": run_snapshot_wapit_season,
+    "backfill_league_teams": run_backfill_league_teams,
+    "check_league_teams": run_check_league_teams,
+    "migrate_chat_reactions": run_migrate_chat_reactions,
+    "compact_wapit_chat": run_compact_wapit_chat,
+}
+
 # Define routes
 ROUTES = {
     "OPTIONS": {
@@ -46,6 +64,7 @@ ROUTES = {
 
         # ESPN API
         "/espn/athletes": "get_athletes",
+        "/espn/athletes/search": "get_athlete_search",
         "/espn/teams": "get_teams",
         "/espn/site/team": "get_site_team",
         "/espn/core/team": "get_core_team",
@@ -77,12 +96,17 @@ ROUTES = {
 
         # NCAA API
         "/ncaa/schools": "get_schools",
+        "/ncaa/schools/lookup": "get_school_lookup",
         "/ncaa/schedule": "get_schedule",
         "/ncaa/scoreboard": "get_scoreboard",
+        "/ncaa/schedule/range": "get_schedule_range",
+        "/ncaa/scoreboard/range": "get_scoreboard_range",
         "/ncaa/game": "get_game_details",
         "/ncaa/wapit/players": "get_wapit_players",
         "/ncaa/wapit/stats/player": "get_wapit_stats",
+        "/ncaa/wapit/stats/players": "get_wapit_stats_bulk",
         "/ncaa/wapit/stats/league": "get_all_wapit_stats",
+        "/ncaa/wapit/bracket": "get_wapit_bracket",
         "/ncaa/wapit/league": "get_wapit_league",
 
         # PICK POOLR API
@@ -95,6 +119,7 @@ ROUTES = {
         "/health": "post_health",
 
         # NCAA API
+        "/ncaa/schools/lookup": "post_school_lookup",
         "/ncaa/wapit/league": "post_wapit_draft",
 
         # PICK POOLR API
@@ -134,6 +159,8 @@ def match_route(event, logger):
         # ESPN API
         elif path == "GET /espn/athletes":
             return get_athletes(event, logger)
+        elif path == "GET /espn/athletes/search":
+            return get_athlete_search(event, logger)
         elif path == "GET /espn/teams":
             return get_teams(event, logger)
         elif path == "GET /espn/site/team":
@@ -194,18 +221,28 @@ def match_route(event, logger):
         # NCAA API
         elif path == "GET /ncaa/schools":
             return get_schools(event, logger)
+        elif path == "GET /ncaa/schools/lookup":
+            return get_school_lookup(event, logger)
         elif path == "GET /ncaa/schedule":
             return get_schedule(event, logger)
         elif path == "GET /ncaa/scoreboard":
             return get_scoreboard(event, logger)
+        elif path == "GET /ncaa/schedule/range":
+            return get_schedule_range(event, logger)
+        elif path == "GET /ncaa/scoreboard/range":
+            return get_scoreboard_range(event, logger)
         elif path == "GET /ncaa/game":
             return get_game_details(event, logger)
         elif path == "GET /ncaa/wapit/players":
             return get_wapit_players(event, logger)
         elif path == "GET /ncaa/wapit/stats/player":
             return get_wapit_stats(event, logger)
+        elif path == "GET /ncaa/wapit/stats/players":
+            return get_wapit_stats_bulk(event, logger)
         elif path == "GET /ncaa/wapit/stats/league":
             return get_all_wapit_stats(event, logger)
+        elif path == "GET /ncaa/wapit/bracket":
+            return get_wapit_bracket(event, logger)
         elif path == "GET /ncaa/wapit/league/{league_id}/year/{year}":
             logger.info("GETTING WAPIT LEAGUE!!!")
             status_code, body = get_wapit_league(event, logger)
@@ -213,6 +250,11 @@ def match_route(event, logger):
         elif path == "GET /ncaa/wapit/league/{league_id}/year/{year}/chat":
             status_code, body = get_wapit_chat(event, logger)
             return status_code, body
+        elif path == "GET /ncaa/wapit/league/{league_id}/year/{year}/leaderboard":
+            status_code, body = get_wapit_leaderboard(event, logger)
+            return status_code, body
+        elif path == "GET /ncaa/wapit/league/{league_id}/year/{year}/draft/changes":
+            return get_wapit_draft_changes(event, logger)
 
         # PICK POOLR API
         elif path == "GET /pick-poolr/bets":
@@ -228,6 +270,9 @@ def match_route(event, logger):
             return post_health(event, logger)
 
         # NCAA API
+        elif path == "POST /ncaa/schools/lookup":
+            return post_school_lookup(event, logger)
+
         elif path == "POST /ncaa/wapit/league/{league_id}/year/{year}":
             return post_wapit_draft(event, logger)
         
@@ -248,6 +293,10 @@ def match_route(event, logger):
             status_code, body = post_wapit_draft_bulk(event, logger)
             return status_code, body
 
+        elif path == "POST /ncaa/wapit/league/{league_id}/year/{year}/draft/pick":
+            status_code, body = post_wapit_draft_pick(event, logger)
+            return status_code, body
+
         # PICK POOLR API
         elif path == "POST /pick-poolr/bet":
             return create_bet_record(event, logger)
@@ -287,18 +336,36 @@ def handler(event, context):
 
     status_code = None
     response_body = {}
+    headers = None
 
     try:
+        # Scheduled/background tasks
+        if "task" in event:
+            task = TASKS.get(event["task"])
+            result = task(event, logger) if task else return_404(event, logger)
+
+        # WebSocket API ($connect, $disconnect, messages) for WAPIT chat/draft push
+        elif is_websocket_event(event):
+            result = handle_websocket(event, logger)
+
         # Route the request
         # Check if http_method is OPTIONS
-        status_code, response_body = match_route(event, logger)
+        else:
+            # Absolute deadline for routes that wait (long-polls)
+            if hasattr(context, "get_remaining_time_in_millis"):
+                event["lambdaDeadline"] = time.time() + context.get_remaining_time_in_millis() / 1000
+            result = match_route(event, logger)
+
+        # Routes may return (status, body) or (status, body, extra headers)
+        status_code, response_body = result[0], result[1]
+        headers = result[2] if len(result) > 2 else None
 
     except Exception as e:
         logger.exception("Exception caught in handler.py!!!")
         logger.exception(e)
         status_code, response_body = return_500(event, logger)
 
-    return build_response(status_code, response_body)
+    return build_response(status_code, response_body, headers)
 
 def handle_options(event, logger):
     return 200, {
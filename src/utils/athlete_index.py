@@ -0,0 +1,157 @@
+import re
+import heapq
+import unicodedata
+from bisect import bisect_left
+
+#########################
+# ATHLETE SEARCH INDEX  #
+#########################
+
+'''
+In-memory typeahead index over an athlete catalog.
+
+    - Prefix index: every name token, sorted, with the athletes that have it.
+      A query token is resolved with a bisect over the sorted tokens.
+    - Trigram index: trigrams of the padded full name -> athlete positions.
+      Used as a fallback for typos and partial middles ("mahom" -> "Mahomes").
+
+Athletes are stored column-wise (ids, names, teams, positions) and referenced
+by position, so the whole index round-trips through to_dict/from_dict as plain
+lists without per-athlete dicts.
+'''
+
+MAX_RESULTS = 50
+
+# Scores for how well a name matches the query
+EXACT_MATCH = 100
+FULL_PREFIX_MATCH = 80
+TOKEN_PREFIX_MATCH = 60
+FUZZY_MATCH = 40
+
+
+# "Ja'Marr Chase Jr." -> "jamarr chase jr"
+def normalize_name(name):
+    name = unicodedata.normalize("NFKD", name or "")
+    name = "".join(c for c in name if not unicodedata.combining(c)).lower()
+    name = re.sub(r"['’.]", "", name)
+    return " ".join(re.sub(r"[^a-z0-9]+", " ", name).split())
+
+
+def trigrams(normalized):
+    padded = f"  {normalized} "
+    return {padded[i:i + 3] for i in range(len(padded) - 2)}
+
+
+class AthleteIndex:
+    def __init__(self, ids, names, teams, positions):
+        self.ids = ids
+        self.names = names
+        self.teams = teams
+        self.positions = positions
+        self._normalized = [normalize_name(n) for n in names]
+
+        postings = {}
+        grams = {}
+        for doc, normalized in enumerate(self._normalized):
+            for token in set(normalized.split()):
+                postings.setdefault(token, []).append(doc)
+            for gram in trigrams(normalized):
+                grams.setdefault(gram, []).append(doc)
+
+        self._tokens = sorted(postings)
+        self._token_docs = [postings[t] for t in self._tokens]
+        self._trigrams = grams
+        self._trigram_counts = [len(trigrams(n)) for n in self._normalized]
+
+    def __len__(self):
+        return len(self.ids)
+
+    # Build from ESPN athlete items (already trimmed to id/name/team/position)
+    @classmethod
+    def from_athletes(cls, athletes):
+        return cls(
+            [a["id"] for a in athletes],
+            [a["name"] for a in athletes],
+            [a.get("team") for a in athletes],
+            [a.get("position") for a in athletes],
+        )
+
+    # Compact column-wise form used for the cache snapshot
+    def to_dict(self):
+        return {"ids": self.ids, "names": self.names, "teams": self.teams, "positions": self.positions}
+
+    @classmethod
+    def from_dict(cls, data):
+        return cls(data["ids"], data["names"], data["teams"], data["positions"])
+
+    # Athletes having a token starting with prefix
+    def _prefix_docs(self, prefix):
+        docs = set()
+        i = bisect_left(self._tokens, prefix)
+        while i < len(self._tokens) and self._tokens[i].startswith(prefix):
+            docs.update(self._token_docs[i])
+            i += 1
+        return docs
+
+    def _score(self, doc, query):
+        name = self._normalized[doc]
+        if name == query:
+            return EXACT_MATCH
+        if name.startswith(query):
+            return FULL_PREFIX_MATCH
+        # Shorter names rank higher among token prefix matches
+        return TOKEN_PREFIX_MATCH - min(len(name), 19) / 20
+
+    def _matches_filters(self, doc, team, position):
+        if team is not None and str(self.teams[doc]) != str(team):
+            return False
+        if position is not None and (self.positions[doc] or "").upper() != position.upper():
+            return False
+        return True
+
+    def search(self, query, team=None, position=None, limit=10):
+        query = normalize_name(query)
+        limit = max(1, min(int(limit), MAX_RESULTS))
+        if not query:
+            return []
+
+        # Every query token must prefix some token of the name
+        candidates = None
+        for token in sorted(query.split(), key=len, reverse=True):
+            docs = self._prefix_docs(token)
+            candidates = docs if candidates is None else candidates & docs
+            if not candidates:
+                break
+
+        scored = {
+            doc: self._score(doc, query)
+            for doc in candidates
+            if self._matches_filters(doc, team, position)
+        }
+
+        # Not enough prefix hits - fall back to trigram similarity
+        if len(scored) < limit and len(query) >= 3:
+            query_grams = trigrams(query)
+            shared = {}
+            for gram in query_grams:
+                for doc in self._trigrams.get(gram, ()):
+                    shared[doc] = shared.get(doc, 0) + 1
+
+            threshold = max(2, len(query_grams) // 2)
+            for doc, count in shared.items():
+                if count < threshold or doc in scored or not self._matches_filters(doc, team, position):
+                    continue
+                similarity = count / (len(query_grams) + self._trigram_counts[doc] - count)
+                scored[doc] = FUZZY_MATCH * similarity
+
+        best = heapq.nlargest(limit, scored.items(), key=lambda x: (x[1], -len(self.names[x[0]])))
+        return [
+            {
+                "id": self.ids[doc],
+                "name": self.names[doc],
+                "team": self.teams[doc],
+                "position": self.positions[doc],
+                "score": round(score, 2),
+            }
+            for doc, score in best
+        ]
@@ -0,0 +1,54 @@
+import time
+import threading
+from collections import OrderedDict
+
+####################
+# IN-MEMORY CACHE  #
+####################
+
+# Module level state survives across warm invocations of the same container.
+# Entries are evicted least-recently-used once MAX_ENTRIES is reached.
+MAX_ENTRIES = 256
+
+_entries = OrderedDict()
+_lock = threading.Lock()
+
+
+# Get a value from the memory cache, or default if missing/expired
+def cache_get(key, default=None):
+    with _lock:
+        entry = _entries.get(key)
+        if entry is None:
+            return default
+
+        value, expires_at = entry
+        if expires_at is not None and expires_at <= time.time():
+            del _entries[key]
+            return default
+
+        _entries.move_to_end(key)
+        return value
+
+
+# Put a value in the memory cache. ttl=None keeps it for the life of the container
+def cache_set(key, value, ttl=None):
+    expires_at = None if ttl is None else time.time() + ttl
+    with _lock:
+        _entries[key] = (value, expires_at)
+        _entries.move_to_end(key)
+        while len(_entries) > MAX_ENTRIES:
+            _entries.popitem(last=False)
+    return value
+
+
+# Drop a single key from the memory cache
+def cache_delete(key):
+    with _lock:
+        _entries.pop(key, None)
+
+
+# Drop every key starting with the given prefix
+def cache_delete_prefix(prefix):
+    with _lock:
+        for key in [k for k in _entries if k.startswith(prefix)]:
+            del _entries[key]
@@ -0,0 +1,236 @@
+import os
+import json
+import mmap
+import time
+import zlib
+import struct
+import logging
+
+logging.basicConfig()
+logger = logging.getLogger(__name__)
+logger.setLevel(logging.INFO)
+
+####################
+# /tmp DISK CACHE  #
+####################
+
+'''
+Lambda keeps /tmp around between warm invocations, so large upstream payloads
+that rarely change (NCAA schools, finished March Madness seasons) are stored
+there as "datasets". Each dataset is a single file:
+
+    [header][record 0][record 1]...[record N-1][index]
+
+    header  - magic, format version, record count, index offset/length, index crc32
+    record  - zlib compressed JSON for one record
+    index   - zlib compressed JSON {"meta": {...}, "keys": [[key, offset, length, crc32], ...]}
+
+Only the header and the index are read eagerly. Records are sliced out of an
+mmap on demand and their crc32 is checked before they are decoded, so a lookup
+of one school never pulls the whole list into the heap.
+'''
+
+CACHE_DIR = os.environ.get("DISK_CACHE_DIR", "/tmp/vsnandy_cache")
+
+# Lambda /tmp defaults to 512 MB - stay well under it
+MAX_DATASET_BYTES = int(os.environ.get("DISK_CACHE_MAX_DATASET_BYTES", 64 * 1024 * 1024))
+MAX_TOTAL_BYTES = int(os.environ.get("DISK_CACHE_MAX_TOTAL_BYTES", 256 * 1024 * 1024))
+
+MAGIC = b"VSDC"
+FORMAT_VERSION = 1
+HEADER = struct.Struct("<4sHIQQI")  # magic, version, count, index offset, index length, index crc32
+
+
+class CorruptDatasetError(Exception):
+    pass
+
+
+def _dataset_path(name):
+    safe_name = "".join(c if c.isalnum() or c in "-_." else "_" for c in name)
+    return os.path.join(CACHE_DIR, f"{safe_name}.bin")
+
+
+def _dumps(obj):
+    return zlib.compress(json.dumps(obj, separators=(",", ":")).encode("utf-8"))
+
+
+def _loads(data):
+    return json.loads(zlib.decompress(data))
+
+
+# Read-only view over a dataset file
+class DiskDataset:
+    def __init__(self, path):
+        self.path = path
+        self._file = open(path, "rb")
+        try:
+            self._map = mmap.mmap(self._file.fileno(), 0, access=mmap.ACCESS_READ)
+        except ValueError:
+            # Empty file cannot be mapped
+            self._file.close()
+            raise CorruptDatasetError(f"{path} is empty")
+
+        try:
+            self._load_index()
+        except Exception:
+            self.close()
+            raise
+
+    def _load_index(self):
+        if len(self._map) < HEADER.size:
+            raise CorruptDatasetError(f"{self.path} is truncated")
+
+        magic, version, count, index_offset, index_length, index_crc = HEADER.unpack_from(self._map, 0)
+        if magic != MAGIC or version != FORMAT_VERSION:
+            raise CorruptDatasetError(f"{self.path} has an unknown format")
+        if index_offset + index_length != len(self._map):
+            raise CorruptDatasetError(f"{self.path} is truncated")
+
+        raw_index = self._map[index_offset:index_offset + index_length]
+        if zlib.crc32(raw_index) != index_crc:
+            raise CorruptDatasetError(f"{self.path} index failed crc check")
+
+        index = _loads(raw_index)
+        if len(index["keys"]) != count:
+            raise CorruptDatasetError(f"{self.path} index count mismatch")
+
+        self.meta = index.get("meta", {})
+        self._order = [entry[0] for entry in index["keys"]]
+        self._index = {entry[0]: tuple(entry[1:]) for entry in index["keys"]}
+
+    def __len__(self):
+        return len(self._order)
+
+    def __contains__(self, key):
+        return key in self._index
+
+    def keys(self):
+        return list(self._order)
+
+    # Decode one record, reading only its bytes from the mapped file
+    def get(self, key, default=None):
+        location = self._index.get(key)
+        if location is None:
+            return default
+
+        offset, length, crc = location
+        data = self._map[offset:offset + length]
+        if zlib.crc32(data) != crc:
+            raise CorruptDatasetError(f"{self.path} record {key} failed crc check")
+        return _loads(data)
+
+    # Lazily decode records in their original order
+    def values(self):
+        for key in self._order:
+            yield self.get(key)
+
+    def items(self):
+        for key in self._order:
+            yield key, self.get(key)
+
+    def close(self):
+        self._map.close()
+        self._file.close()
+
+
+# Write a dataset atomically. records is an iterable of (key, json-able value)
+def write_dataset(name, records, meta=None):
+    path = _dataset_path(name)
+    tmp_path = f"{path}.{os.getpid()}.tmp"
+
+    index = []
+    try:
+        os.makedirs(CACHE_DIR, exist_ok=True)
+        with open(tmp_path, "wb") as f:
+            f.write(b"\0" * HEADER.size)
+            offset = HEADER.size
+            seen = set()
+            for key, value in records:
+                key = str(key)
+                if key in seen:
+                    raise ValueError(f"Duplicate key {key}")
+                seen.add(key)
+
+                data = _dumps(value)
+                f.write(data)
+                index.append([key, offset, len(data), zlib.crc32(data)])
+                offset += len(data)
+                if offset > MAX_DATASET_BYTES:
+                    raise ValueError(f"Dataset {name} exceeds {MAX_DATASET_BYTES} bytes")
+
+            raw_index = _dumps({"meta": {**(meta or {}), "createdAt": time.time()}, "keys": index})
+            f.write(raw_index)
+            f.seek(0)
+            f.write(HEADER.pack(MAGIC, FORMAT_VERSION, len(index), offset, len(raw_index), zlib.crc32(raw_index)))
+
+        os.replace(tmp_path, path)
+    except Exception as e:
+        logger.warning(f"[disk_cache.py / write_dataset({name})] - Not cached: {e}")
+        if os.path.exists(tmp_path):
+            os.remove(tmp_path)
+        return False
+
+    _enforce_total_size(keep=path)
+    return True
+
+
+# Open a dataset, or None if it is missing, expired or fails its integrity checks
+def open_dataset(name, max_age=None):
+    path = _dataset_path(name)
+    if not os.path.exists(path):
+        return None
+
+    try:
+        dataset = DiskDataset(path)
+    except (CorruptDatasetError, OSError, ValueError, KeyError, zlib.error) as e:
+        logger.warning(f"[disk_cache.py / open_dataset({name})] - Discarding: {e}")
+        delete_dataset(name)
+        return None
+
+    if max_age is not None and time.time() - dataset.meta.get("createdAt", 0) > max_age:
+        dataset.close()
+        return None
+
+    # Touch so size based eviction drops the least recently used datasets first
+    os.utime(path, None)
+    return dataset
+
+
+# Read every record of a dataset into a list, or None on a miss
+def read_dataset(name, max_age=None):
+    dataset = open_dataset(name, max_age)
+    if dataset is None:
+        return None
+
+    try:
+        return list(dataset.values())
+    except (CorruptDatasetError, zlib.error, ValueError) as e:
+        logger.warning(f"[disk_cache.py / read_dataset({name})] - Discarding: {e}")
+        delete_dataset(name)
+        return None
+    finally:
+        dataset.close()
+
+
+def delete_dataset(name):
+    path = _dataset_path(name)
+    if os.path.exists(path):
+        os.remove(path)
+
+
+# Evict least recently used datasets until the cache dir fits MAX_TOTAL_BYTES
+def _enforce_total_size(keep=None):
+    files = []
+    for entry in os.scandir(CACHE_DIR):
+        if entry.is_file() and entry.name.endswith(".bin"):
+            stat = entry.stat()
+            files.append((stat.st_mtime, stat.st_size, entry.path))
+
+    total = sum(size for _, size, _ in files)
+    for _, size, path in sorted(files):
+        if total <= MAX_TOTAL_BYTES:
+            break
+        if path == keep:
+            continue
+        os.remove(path)
+        total -= size
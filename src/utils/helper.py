@@ -1,9 +1,23 @@
 import json
+import base64
+import time
+import random
 
+from concurrent.futures import ThreadPoolExecutor, wait
 from datetime import datetime, timedelta
 from decimal import Decimal
 from itertools import groupby
 
+# Shared pool for independent upstream/DB calls. Module level so warm
+# invocations reuse the threads, and bounded so a wide fan-out queues
+# instead of opening dozens of connections at once
+MAX_WORKERS = 8
+_executor = ThreadPoolExecutor(max_workers=MAX_WORKERS)
+
+# Separate pool for run_with_deadline. Calls that miss their deadline keep running,
+# and here they can only hold up other deadline calls, never the shared pool
+_deadline_executor = ThreadPoolExecutor(max_workers=MAX_WORKERS, thread_name_prefix="deadline")
+
 ####################
 # HELPER FUNCTIONS #
 ####################
@@ -14,23 +28,100 @@ class DateTimeEncoder(json.JSONEncoder):
             return obj.isoformat()
         if isinstance(obj, Decimal):
             return float(obj)
+        # DynamoDB string/number sets, e.g. TakenPlayers on league meta
+        if isinstance(obj, (set, frozenset)):
+            return sorted(obj, key=str)
         return super().default(obj)
 
+# Serialize the way build_response does, for bodies (or parts of them) built ahead of time
+def to_json(value):
+    return json.dumps(value, cls=DateTimeEncoder)
+
+# A response body that is already JSON text, sent as-is by build_response
+class JSONBody(str):
+    pass
+
+# body as JSON text with key set to raw_json, a value serialized earlier (e.g. cached)
+def json_body_with(body, key, raw_json):
+    head = to_json({k: v for k, v in body.items() if k != key})
+    separator = ", " if len(head) > 2 else ""
+    return JSONBody(f'{head[:-1]}{separator}{json.dumps(key)}: {raw_json}}}')
+
 # Build the response to send
-def build_response(status_code, response_body=None):
+def build_response(status_code, response_body=None, headers=None):
     response = {
         "statusCode": status_code,
         "headers": {
             "Content-Type": "application/json",
             "Access-Control-Allow-Origin": "https://vsnandy.github.io,http://localhost:3000",
             "Access-Control-Allow-Methods": "OPTIONS,POST,GET,DELETE,PATCH",
-            "Access-Control-Allow-Headers": "Content-Type,Authorization"
+            "Access-Control-Allow-Headers": "Content-Type,Authorization",
+            **(headers or {})
         },
-        "body": json.dumps(response_body, cls=DateTimeEncoder) if response_body else None
+        "body": response_body if isinstance(response_body, JSONBody) else json.dumps(response_body, cls=DateTimeEncoder) if response_body else None
     }
 
     return response
 
+# Run fn over items on the shared pool, results come back in input order
+def map_concurrently(fn, items):
+    futures = [_executor.submit(fn, item) for item in items]
+    return [future.result() for future in futures]
+
+# Run {name: fn} on the shared pool and wait at most timeout seconds for all of them
+# Returns ({name: result}, {name: exception or "timeout"}). Calls still running at
+# the deadline are left to finish in the background on their own pool
+def run_with_deadline(calls, timeout):
+    futures = {name: _deadline_executor.submit(fn) for name, fn in calls.items()}
+    done, _ = wait(futures.values(), timeout=timeout)
+
+    results, failed = {}, {}
+    for name, future in futures.items():
+        if future not in done:
+            failed[name] = "timeout"
+        elif future.exception() is not None:
+            failed[name] = future.exception()
+        else:
+            results[name] = future.result()
+    return results, failed
+
+# BatchWriteItem limits: 25 requests per call, unprocessed items retried with backoff
+BATCH_WRITE_SIZE = 25
+BATCH_WRITE_MAX_ATTEMPTS = 8
+
+# Send [{"PutRequest": ...} / {"DeleteRequest": ...}] for one table in 25-item
+# batches on the shared pool. Returns the number of requests written
+def batch_write_concurrently(dynamodb, table_name, requests):
+    def write(chunk):
+        pending = {table_name: chunk}
+        attempt = 0
+        while pending:
+            response = dynamodb.batch_write_item(RequestItems=pending)
+            pending = response.get("UnprocessedItems") or None
+            if pending:
+                attempt += 1
+                if attempt >= BATCH_WRITE_MAX_ATTEMPTS:
+                    raise RuntimeError(f"{table_name}: unprocessed items after {attempt} attempts")
+                time.sleep(random.uniform(0, min(0.05 * 2 ** attempt, 2)))
+        return len(chunk)
+
+    chunks = [requests[i:i + BATCH_WRITE_SIZE] for i in range(0, len(requests), BATCH_WRITE_SIZE)]
+    return sum(map_concurrently(write, chunks))
+
+# Opaque pagination tokens: url-safe base64 of a small JSON object
+def encode_cursor(data):
+    return base64.urlsafe_b64encode(json.dumps(data, separators=(",", ":")).encode("utf-8")).decode("ascii").rstrip("=")
+
+# Raises ValueError for anything that isn't a token from encode_cursor
+def decode_cursor(token):
+    try:
+        data = json.loads(base64.urlsafe_b64decode(token + "=" * (-len(token) % 4)))
+    except Exception:
+        raise ValueError("Invalid cursor")
+    if not isinstance(data, dict):
+        raise ValueError("Invalid cursor")
+    return data
+
 # Calculate the nth day of week of the month/year
 def get_nth_day(year, month, day, n):
     # Get first day of month
@@ -48,22 +139,32 @@ def get_nth_day(year, month, day, n):
 
     return date
 
+# Cognito user fields and attributes the league pages use
+USER_FIELDS = ("Username", "Enabled", "UserStatus")
+USER_ATTRIBUTES = {"sub", "email", "name", "given_name", "family_name", "preferred_username", "picture"}
+
 # Get users in a cognito user group
 # Will be used to get all the league members/teams
+# Follows NextToken through every page, each user trimmed to USER_FIELDS/USER_ATTRIBUTES
 def get_users_in_group(cognito, user_pool_id, group_name, logger):
     logger.info("Getting cognito users for User Pool ID - " + user_pool_id)
     users = []
-    
-    response = cognito.list_users_in_group(
-        UserPoolId=user_pool_id,
-        GroupName=group_name,
-        Limit=60
-    )
-
-    logger.info("get_users_in_group response: ")
-    logger.info(response)
 
-    users.extend(response["Users"])
+    kwargs = {"UserPoolId": user_pool_id, "GroupName": group_name, "Limit": 60}
+    while True:
+        response = cognito.list_users_in_group(**kwargs)
+        users.extend(
+            {
+                **{field: user[field] for field in USER_FIELDS if field in user},
+                "Attributes": [a for a in user.get("Attributes", []) if a["Name"] in USER_ATTRIBUTES],
+            }
+            for user in response["Users"]
+        )
+        if not response.get("NextToken"):
+            break
+        kwargs["NextToken"] = response["NextToken"]
+
+    logger.info(f"get_users_in_group - {len(users)} users in {group_name}")
 
     return users
 
@@ -0,0 +1,122 @@
+import re
+import unicodedata
+from difflib import SequenceMatcher
+
+#######################
+# NCAA SCHOOLS INDEX  #
+#######################
+
+'''
+Lookup tables over the ncaa.com schools list, e.g.
+
+    {"slug": "michigan-st", "name": "Michigan St.", "long_name": "Michigan State University"}
+
+Exact lookups go through dicts keyed by id, SEO name (slug) and normalized
+name. Fuzzy lookups expand abbreviations ("St." -> state/saint, "&" -> and)
+and then fall back to the closest name sharing a token with the query.
+'''
+
+FUZZY_CUTOFF = 0.85
+
+# Abbreviations expanded before comparing names. "st" is ambiguous, so both
+# readings are indexed ("Michigan St." / "St. John's")
+ABBREVIATIONS = {
+    "univ": ["university"],
+    "u": ["university"],
+    "col": ["college"],
+    "mt": ["mount"],
+    "ft": ["fort"],
+    "so": ["southern"],
+    "no": ["northern"],
+    "st": ["state", "saint"],
+}
+NOISE_WORDS = {"the", "of", "university", "college"}
+
+
+def normalize_school(name):
+    name = unicodedata.normalize("NFKD", name or "")
+    name = "".join(c for c in name if not unicodedata.combining(c)).lower()
+    name = name.replace("&", " and ").replace("'", "").replace("’", "")
+    return " ".join(re.sub(r"[^a-z0-9]+", " ", name).split())
+
+
+# Every reading of a normalized name, with abbreviations expanded and noise words dropped
+def name_variants(normalized):
+    variants = [[]]
+    for token in normalized.split():
+        readings = ABBREVIATIONS.get(token, [token])
+        variants = [v + [r] for v in variants for r in readings]
+    return {" ".join(t for t in v if t not in NOISE_WORDS) or " ".join(v) for v in variants}
+
+
+class SchoolsIndex:
+    def __init__(self, schools):
+        self.schools = schools
+        self.by_id = {}
+        self.by_seo = {}
+        self.by_name = {}
+        self.by_variant = {}
+        self.by_token = {}
+
+        for i, school in enumerate(schools):
+            school_id = school.get("id", school.get("ncaaOrgId"))
+            if school_id is not None:
+                self.by_id[str(school_id)] = i
+            if school.get("slug"):
+                self.by_seo[school["slug"].lower()] = i
+
+            for name in (school.get("name"), school.get("long_name")):
+                if not name:
+                    continue
+                normalized = normalize_school(name)
+                self.by_name.setdefault(normalized, i)
+                for variant in name_variants(normalized):
+                    self.by_variant.setdefault(variant, i)
+                    for token in variant.split():
+                        self.by_token.setdefault(token, set()).add(variant)
+
+    def __len__(self):
+        return len(self.schools)
+
+    def get_by_id(self, school_id):
+        i = self.by_id.get(str(school_id))
+        return None if i is None else self.schools[i]
+
+    def get_by_seo(self, seo_name):
+        i = self.by_seo.get((seo_name or "").lower())
+        return None if i is None else self.schools[i]
+
+    def get_by_name(self, name):
+        i = self.by_name.get(normalize_school(name))
+        return None if i is None else self.schools[i]
+
+    # Resolve any school reference, returns (school, match type) or (None, None)
+    def resolve(self, value):
+        if value is None or str(value).strip() == "":
+            return None, None
+        value = str(value).strip()
+
+        for getter, match in ((self.get_by_id, "id"), (self.get_by_seo, "seo"), (self.get_by_name, "name")):
+            school = getter(value)
+            if school is not None:
+                return school, match
+
+        normalized = normalize_school(value)
+        variants = name_variants(normalized)
+        for variant in variants:
+            i = self.by_variant.get(variant)
+            if i is not None:
+                return self.schools[i], "variant"
+
+        # Closest indexed name sharing at least one token with the query
+        best, best_ratio = None, FUZZY_CUTOFF
+        for variant in variants:
+            candidates = set().union(*(self.by_token.get(t, ()) for t in variant.split()))
+            for candidate in candidates:
+                ratio = SequenceMatcher(None, variant, candidate).ratio()
+                if ratio > best_ratio:
+                    best, best_ratio = candidate, ratio
+
+        if best is None:
+            return None, None
+        return self.schools[self.by_variant[best]], "fuzzy"
@@ -0,0 +1,65 @@
+#############################
+# WAPIT BRACKET VIEW        #
+#############################
+
+'''
+Compact bracket tree derived from the mmlContests games:
+
+    {"rounds": [{"roundNumber": 2, "title": "First Round", "slots": [
+        {"bracketId": 201, "contestId": "...", "region": "EAST", "gameState": "F",
+         "startDate": "...", "teams": [{"seoname", "nameShort", "seed", "score", "isWinner"}],
+         "winner": "duke", "advancesTo": 301}
+    ]}]}
+
+Within a round, slots are ordered by bracketId and pairs of slots feed one slot
+of the next round. First Four winners are matched to the First Round slot they
+show up in, since those games don't follow the pairing.
+'''
+
+FIRST_FOUR = 1
+BRACKET_TEAM_FIELDS = ("seoname", "nameShort", "seed", "score", "isWinner")
+
+
+def _slot(game):
+    teams = [{field: team.get(field) for field in BRACKET_TEAM_FIELDS} for team in game.get("teams", [])]
+    winner = next((team["seoname"] for team in teams if team["isWinner"]), None)
+    return {
+        "bracketId": game.get("bracketId"),
+        "contestId": game.get("contestId"),
+        "region": (game.get("region") or {}).get("title"),
+        "gameState": game.get("gameState"),
+        "startDate": game.get("startDate"),
+        "teams": teams,
+        "winner": winner,
+        "advancesTo": None,
+    }
+
+
+def build_bracket(contests):
+    rounds = {}
+    for game in contests:
+        round_info = game.get("round") or {}
+        entry = rounds.setdefault(round_info.get("roundNumber"), {
+            "roundNumber": round_info.get("roundNumber"),
+            "title": round_info.get("title"),
+            "slots": [],
+        })
+        entry["slots"].append(_slot(game))
+
+    ordered = [rounds[number] for number in sorted(n for n in rounds if n is not None)]
+    for entry in ordered:
+        entry["slots"].sort(key=lambda slot: int(slot["bracketId"] or 0))
+
+    # Link each slot to the slot its winner plays in next
+    for current, following in zip(ordered, ordered[1:]):
+        if current["roundNumber"] == FIRST_FOUR:
+            by_team = {team["seoname"]: slot for slot in following["slots"] for team in slot["teams"]}
+            for slot in current["slots"]:
+                target = by_team.get(slot["winner"])
+                slot["advancesTo"] = target["bracketId"] if target else None
+        else:
+            for i, slot in enumerate(current["slots"]):
+                if i // 2 < len(following["slots"]):
+                    slot["advancesTo"] = following["slots"][i // 2]["bracketId"]
+
+    return {"rounds": ordered}
@@ -0,0 +1,104 @@
+from bisect import bisect_left
+
+from utils.athlete_index import normalize_name
+from utils.schools_index import normalize_school
+
+###########################
+# WAPIT PLAYER POOL       #
+###########################
+
+'''
+Draftable players for a tournament year: every roster from the First Round,
+each player tagged with their school. Built once per season and filtered in
+memory:
+
+    - school:   SEO name, full or short school name -> player positions
+    - seed:     seed -> player positions
+    - position: roster position (G/F/C) -> player positions
+    - name:     sorted name tokens, a prefix is resolved with a bisect
+
+Filters intersect position sets, so results keep the pool order (bracket order).
+'''
+
+MAX_PAGE_SIZE = 500
+FIRST_ROUND = 2
+
+
+class PlayerPool:
+    def __init__(self, players):
+        self.players = players
+        self.ids = [str(p.get("id")) for p in players]
+        self.by_school = {}
+        self.by_seed = {}
+        self.by_position = {}
+
+        postings = {}
+        for i, player in enumerate(players):
+            for name in (player.get("schoolSeoName"), player.get("school"), player.get("schoolNameShort")):
+                if name:
+                    self.by_school.setdefault(normalize_school(name), set()).add(i)
+            self.by_seed.setdefault(str(player.get("seed")), set()).add(i)
+            self.by_position.setdefault((player.get("position") or "").upper(), set()).add(i)
+            for token in set(normalize_name(f"{player.get('firstName')} {player.get('lastName')}").split()):
+                postings.setdefault(token, []).append(i)
+
+        self._tokens = sorted(postings)
+        self._token_docs = [postings[t] for t in self._tokens]
+
+    def __len__(self):
+        return len(self.players)
+
+    # Players in the First Round games of the mmlContests payload, copied with school fields
+    @classmethod
+    def from_contests(cls, contests):
+        players = []
+        for game in contests:
+            if game["round"]["roundNumber"] != FIRST_ROUND:
+                continue
+            for team in game["teams"]:
+                school = {
+                    "school": team["nameFull"],
+                    "schoolNameShort": team.get("nameShort"),
+                    "schoolSeoName": team.get("seoname"),
+                    "seed": team.get("seed"),
+                }
+                players.extend({**player, **school} for player in team["roster"])
+        return cls(players)
+
+    # Players having a name token starting with prefix
+    def _prefix_docs(self, prefix):
+        docs = set()
+        i = bisect_left(self._tokens, prefix)
+        while i < len(self._tokens) and self._tokens[i].startswith(prefix):
+            docs.update(self._token_docs[i])
+            i += 1
+        return docs
+
+    # Returns (total matches, page of players)
+    def filter(self, school=None, seed=None, position=None, name=None, exclude_ids=None, offset=0, limit=None):
+        candidates = None
+        selections = []
+        if school:
+            selections.append(self.by_school.get(normalize_school(school), set()))
+        if seed:
+            selections.append(self.by_seed.get(str(seed), set()))
+        if position:
+            selections.append(self.by_position.get(position.upper(), set()))
+        if name:
+            # Every query token must prefix some token of the name
+            for token in normalize_name(name).split():
+                selections.append(self._prefix_docs(token))
+
+        for docs in sorted(selections, key=len):
+            candidates = set(docs) if candidates is None else candidates & docs
+            if not candidates:
+                break
+
+        docs = range(len(self.players)) if candidates is None else sorted(candidates)
+        if exclude_ids:
+            docs = [i for i in docs if self.ids[i] not in exclude_ids]
+
+        total = len(docs)
+        limit = total if limit is None else max(0, min(int(limit), MAX_PAGE_SIZE))
+        offset = max(0, int(offset))
+        return total, [self.players[i] for i in docs[offset:offset + limit]]
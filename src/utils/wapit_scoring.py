@@ -0,0 +1,113 @@
+import json
+import zlib
+
+###########################
+# WAPIT LEAGUE SCORING    #
+###########################
+
+'''
+Scores a WAPIT league from its draft picks and the tournament player stats.
+
+Scoring rules live on the league meta item (wapit_meta.ScoringRules):
+
+    {
+        "weights":     {"points": 1, "totalRebounds": 0.5},            # per stat, every game
+        "bonuses":     [{"stat": "points", "min": 20, "bonus": 5}],     # per game, stat >= min
+        "elimination": "count"                                          # or "exclude"
+    }
+
+"count" keeps the points of eliminated players, "exclude" drops them from the
+team total. Every drafted player's games are flattened into one set of stat
+columns, scored in a single pass and summed back per team.
+'''
+
+DEFAULT_SCORING_RULES = {
+    "weights": {"points": 1},
+    "bonuses": [],
+    "elimination": "count",
+}
+
+
+def scoring_rules_from_meta(meta):
+    rules = {**DEFAULT_SCORING_RULES, **((meta or {}).get("ScoringRules") or {})}
+    if rules["elimination"] not in ("count", "exclude"):
+        rules["elimination"] = "count"
+    return rules
+
+
+# Short stable hash of the rules, used in leaderboard cache keys
+def rules_hash(rules):
+    return zlib.crc32(json.dumps(rules, sort_keys=True, default=str).encode("utf-8"))
+
+
+def _number(value):
+    try:
+        return float(value)
+    except (TypeError, ValueError):
+        return 0.0
+
+
+# A player is out once their school loses a finished game
+def is_eliminated(boxscores):
+    return any(row.get("gameState") == "F" and row.get("isWinner") is False for row in boxscores)
+
+
+# teams: {TeamID: [pick, ...]}, stats: {player id: entry with boxscores}
+# Returns teams ranked by total points
+def score_league(teams, stats, rules):
+    weights = {stat: float(w) for stat, w in rules["weights"].items()}
+    bonuses = [(b["stat"], float(b["min"]), float(b["bonus"])) for b in rules["bonuses"]]
+    columns = sorted(set(weights) | {stat for stat, _, _ in bonuses})
+
+    # Flatten every drafted player's games into column arrays: one array per stat
+    owners = []
+    values = {stat: [] for stat in columns}
+    players = []
+    for team_id, picks in teams.items():
+        for pick in picks:
+            entry = stats.get(str(pick.get("PlayerID")), {})
+            boxscores = entry.get("boxscores", [])
+            player_index = len(players)
+            players.append({
+                "teamId": team_id,
+                "playerId": pick.get("PlayerID"),
+                "playerName": pick.get("PlayerName"),
+                "pickNumber": pick.get("PickNumber"),
+                "school": entry.get("schoolNameShort"),
+                "gamesPlayed": len(boxscores),
+                "eliminated": is_eliminated(boxscores),
+                "points": 0.0,
+            })
+            for row in boxscores:
+                owners.append(player_index)
+                for stat in columns:
+                    values[stat].append(_number(row.get(stat)))
+
+    # One pass over the columns: weighted stats plus per-game bonuses
+    game_scores = [0.0] * len(owners)
+    for stat, weight in weights.items():
+        game_scores = [score + weight * v for score, v in zip(game_scores, values[stat])]
+    for stat, minimum, bonus in bonuses:
+        game_scores = [score + (bonus if v >= minimum else 0.0) for score, v in zip(game_scores, values[stat])]
+
+    for player_index, score in zip(owners, game_scores):
+        players[player_index]["points"] += score
+
+    leaderboard = {}
+    for player in players:
+        player["points"] = round(player["points"], 2)
+        team = leaderboard.setdefault(player["teamId"], {
+            "teamId": player["teamId"], "points": 0.0, "playersRemaining": 0, "players": []
+        })
+        team["players"].append(player)
+        if not player["eliminated"]:
+            team["playersRemaining"] += 1
+        if not (player["eliminated"] and rules["elimination"] == "exclude"):
+            team["points"] += player["points"]
+
+    ranked = sorted(leaderboard.values(), key=lambda t: (-t["points"], -t["playersRemaining"], str(t["teamId"])))
+    for rank, team in enumerate(ranked, start=1):
+        team["rank"] = rank
+        team["points"] = round(team["points"], 2)
+        team["players"].sort(key=lambda p: -p["points"])
+    return ranked
@@ -0,0 +1,130 @@
+from functools import lru_cache
+
+#############################
+# WAPIT STATS AGGREGATION   #
+#############################
+
+'''
+Joins March Madness rosters to box scores for every counted game.
+
+Each game's box score is indexed once by (ncaaOrgId, normalized player name),
+so every roster player is matched with a single dict lookup instead of
+scanning the team's playerStats and concatenating names per comparison.
+'''
+
+# Fields copied from the school onto each player entry
+SCHOOL_FIELDS = {
+    "schoolColor": "color",
+    "seed": "seed",
+    "schoolNameFull": "nameFull",
+    "schoolNameShort": "nameShort",
+    "schoolName6Char": "name6Char",
+    "schoolSeoName": "seoname",
+    "schoolNickname": "nickname",
+}
+
+
+# "Tre  Smith Jr." / "tre smith jr" -> "tre smith jr"
+# Cached, names repeat across games and warm invocations
+@lru_cache(maxsize=16384)
+def player_name_key(first_name, last_name):
+    return " ".join(f"{first_name} {last_name}".replace(".", " ").casefold().split())
+
+
+# Pending games and the First Four don't count
+def is_counted_game(game):
+    return game["gameState"] != "P" and game["round"]["roundNumber"] > 1
+
+
+# {(ncaaOrgId, name key): player boxscore row} for one game
+def index_boxscore(game):
+    return {
+        (team["ncaaOrgId"], player_name_key(row["fname"], row["lname"])): row
+        for team in game["boxscore"]["teamBoxscore"]
+        for row in team["playerStats"]
+    }
+
+
+# Build {player id: player + school fields + boxscores[]} for all counted games
+def aggregate_player_stats(contests):
+    player_stats = {}
+
+    for game in contests:
+        if not is_counted_game(game):
+            continue
+
+        boxscore = index_boxscore(game)
+        game_fields = {
+            "bracketId": game["bracketId"],
+            "contestId": game["contestId"],
+            "roundName": game["round"]["title"],
+            "startDate": game["startDate"],
+            "gameState": game["gameState"],
+        }
+
+        for team in game["teams"]:
+            org_id = team["ncaaOrgId"]
+            team_fields = {**game_fields, "isWinner": team["isWinner"], "score": team["score"]}
+            for player in team["roster"]:
+                row = boxscore.get((org_id, player_name_key(player["firstName"], player["lastName"])))
+                if row is None:
+                    continue
+
+                entry = player_stats.get(player["id"])
+                if entry is None:
+                    entry = player_stats[player["id"]] = {
+                        **player,
+                        **{field: team[source] for field, source in SCHOOL_FIELDS.items()},
+                        "boxscores": [],
+                    }
+
+                entry["boxscores"].append({**team_fields, **row})
+
+    return player_stats
+
+
+# Box score keys that describe the game, the team's result or repeat the player's name
+GAME_FIELDS = ("bracketId", "roundName", "startDate", "gameState")
+TEAM_RESULT_FIELDS = ("isWinner", "score")
+ROW_NAME_FIELDS = ("fname", "lname")
+
+
+# Normalize the aggregated stats map into
+#   teams:     {seo name: school fields}                         once per school
+#   games:     {contestId: game fields, teams: {seo name: score/isWinner}}
+#   players:   {player id: roster fields + team}                 once per player
+#   boxscores: {"playerId": [...], "contestId": [...], stat: [...]}  one array per stat
+def to_columnar(player_stats):
+    teams = {}
+    games = {}
+    players = {}
+    row_players = []
+    rows = []
+
+    for player_id, entry in player_stats.items():
+        team_id = entry.get("schoolSeoName")
+        if team_id not in teams:
+            teams[team_id] = {field: entry.get(field) for field in SCHOOL_FIELDS}
+
+        players[player_id] = {
+            **{k: v for k, v in entry.items() if k not in SCHOOL_FIELDS and k != "boxscores"},
+            "team": team_id,
+        }
+
+        for row in entry.get("boxscores", []):
+            game = games.get(row["contestId"])
+            if game is None:
+                game = games[row["contestId"]] = {**{field: row.get(field) for field in GAME_FIELDS}, "teams": {}}
+            if team_id not in game["teams"]:
+                game["teams"][team_id] = {field: row.get(field) for field in TEAM_RESULT_FIELDS}
+            row_players.append(player_id)
+            rows.append(row)
+
+    skipped = {"contestId", *GAME_FIELDS, *TEAM_RESULT_FIELDS, *ROW_NAME_FIELDS}
+    stat_names = list(dict.fromkeys(field for row in rows for field in row if field not in skipped))
+
+    boxscores = {"playerId": row_players, "contestId": [row["contestId"] for row in rows]}
+    for field in stat_names:
+        boxscores[field] = [row.get(field) for row in rows]
+
+    return {"teams": teams, "games": games, "players": players, "boxscores": boxscores}